@@ -0,0 +1,129 @@
+"""Read-only HTTP API for scoreboards, venue screens and stream overlays.
+
+Runs as its own ASGI process next to the Streamlit app, so scrapers never open a
+Streamlit session:
+
+    uvicorn api:app --host 0.0.0.0 --port 8600
+
+    GET /api/leaderboard[?visao=...]   current ranking (JSON)
+    GET /api/eventos                   live score deltas (Server-Sent Events)
+
+Responses come from the shared leaderboard snapshot. Writes happen in the Streamlit
+process, whose invalidations do not reach this one, so the snapshot is reloaded at most
+once every API_TTL seconds however many requests arrive. Bodies are serialized once per
+snapshot and view; clients that send the ETag back get a 304 with no body.
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from cache import leaderboard_cache
+from transmissao import FIM, transmissor
+
+# Seconds a snapshot is served before it is reloaded from the database
+API_TTL = float(os.environ.get("API_TTL", "1"))
+
+# Seconds of silence before a keep-alive comment, so proxies keep the stream open
+SSE_KEEPALIVE = float(os.environ.get("API_SSE_KEEPALIVE", "15"))
+
+_corpos: dict[tuple[str, str], bytes] = {}
+_CORPOS_MAX = 64
+
+
+def _ranking(leaderboards: dict, visao: str) -> list[dict] | None:
+    """Ranking for a view key, as used by the leaderboard page's ?visao= parameter."""
+    if visao == "geral":
+        return leaderboards["geral"]
+    if visao == "ativa":
+        regata_id = leaderboards["regata_ativa"]
+        return leaderboards["por_regata"][regata_id]["ranking"] if regata_id is not None else []
+    if visao.startswith("regata-") and visao[7:].isdigit():
+        regata = leaderboards["por_regata"].get(int(visao[7:]))
+        return regata["ranking"] if regata else None
+    if visao.startswith("nivel-"):
+        return leaderboards["por_nivel"].get(visao[6:])
+    return None
+
+
+def _corpo(digest: str, leaderboards: dict, visao: str) -> bytes | None:
+    chave = (digest, visao)
+    corpo = _corpos.get(chave)
+    if corpo is None:
+        ranking = _ranking(leaderboards, visao)
+        if ranking is None:
+            return None
+        corpo = json.dumps(
+            {"visao": visao, "versao": digest, "ranking": ranking},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+        if len(_corpos) >= _CORPOS_MAX:
+            _corpos.clear()
+        _corpos[chave] = corpo
+    return corpo
+
+
+async def leaderboard(request: Request) -> Response:
+    visao = request.query_params.get("visao", "geral")
+    # The reload runs synchronous SQLAlchemy; keep it off the loop so SSE clients don't stall
+    snapshot = await run_in_threadpool(leaderboard_cache.get, max_age=API_TTL)
+    corpo = _corpo(snapshot.digest, snapshot.value, visao)
+    if corpo is None:
+        return JSONResponse({"erro": f"Visao desconhecida: {visao}"}, status_code=404)
+
+    etag = f'"{snapshot.digest}-{visao}"'
+    # Rounded up: a sub-second TTL still allows one second of caching downstream
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={math.ceil(API_TTL)}"}
+    if etag in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(corpo, media_type="application/json", headers=headers)
+
+
+async def eventos(request: Request) -> Response:
+    """Score deltas as SSE. Reconnecting clients resume via Last-Event-ID (or ?desde=)."""
+    desde = request.headers.get("last-event-id") or request.query_params.get("desde")
+    fila = transmissor.assinar(int(desde) if desde and desde.isdigit() else None)
+
+    async def fluxo():
+        try:
+            yield b"retry: 2000\n\n"
+            while True:
+                try:
+                    dados = await asyncio.wait_for(fila.get(), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if dados is FIM:
+                    # Fell too far behind; the client reconnects and resumes from the buffer
+                    return
+                yield dados
+        finally:
+            transmissor.cancelar(fila)
+
+    return StreamingResponse(
+        fluxo(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@contextlib.asynccontextmanager
+async def _ciclo_de_vida(app):
+    produtor = asyncio.create_task(transmissor.produzir())
+    yield
+    produtor.cancel()
+
+
+app = Starlette(
+    routes=[Route("/api/leaderboard", leaderboard), Route("/api/eventos", eventos)],
+    lifespan=_ciclo_de_vida,
+)
@@ -1,15 +1,163 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+import threading
+
 import bcrypt
 import streamlit as st
+import streamlit.components.v1 as components
+
+# bcrypt cost factor for new hashes; stored hashes with another cost are rehashed on login
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+# Concurrent bcrypt verifications; bounds the CPU a burst of logins can take from viewers
+AUTH_WORKERS = int(os.environ.get("AUTH_WORKERS", "4"))
+# Session tokens are signed with this key. Without it a random per-process key is used,
+# so tokens stop validating when the app restarts.
+AUTH_SECRET = os.environ.get("AUTH_SECRET", "").encode() or secrets.token_bytes(32)
+# Seconds a session token stays valid
+AUTH_TOKEN_TTL = int(os.environ.get("AUTH_TOKEN_TTL", str(12 * 3600)))
+# Browser cookie holding the session token; kept out of the URL so shared links carry no login
+AUTH_COOKIE = "batalha_sessao"
 
+# Caps concurrent bcrypt runs. The calling script thread still waits for its own
+# verification; the cap only keeps a burst of logins from taking every core.
+_verificacoes = threading.BoundedSemaphore(AUTH_WORKERS)
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds or BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode(), hashed.encode())
 
 
+def precisa_rehash(hashed: str) -> bool:
+    """True when the hash was made with a cost other than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def autenticar(session_factory, User, username: str, password: str) -> dict | None:
+    """Check credentials and return the session user dict, or None.
+
+    Opens a database session only for the lookup. At most AUTH_WORKERS verifications run
+    at once; a hash with an outdated cost is transparently replaced with one at
+    BCRYPT_ROUNDS.
+    """
+    db = session_factory()
+    try:
+        user = db.query(User).filter_by(username=username).first()
+        if user is None:
+            return None
+        with _verificacoes:
+            if not verify_password(password, user.password_hash):
+                return None
+            if precisa_rehash(user.password_hash):
+                user.password_hash = hash_password(password)
+                db.commit()
+        return _dados_usuario(user)
+    finally:
+        db.close()
+
+
+def _dados_usuario(user) -> dict:
+    return {"id": user.id, "username": user.username, "role": user.role, "token_versao": user.token_versao}
+
+
+def _assinatura(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(hmac.new(AUTH_SECRET, payload, hashlib.sha256).digest()).decode().rstrip("=")
+
+
+def emitir_token(user: dict, ttl: int = AUTH_TOKEN_TTL) -> str:
+    """Signed, expiring token carrying the session user. Only proves who it was issued
+    to; restaurar_sessao() still checks the user against the database."""
+    payload = base64.urlsafe_b64encode(json.dumps({**user, "exp": int(time.time()) + ttl}).encode())
+    return f"{payload.decode()}.{_assinatura(payload)}"
+
+
+def ler_token(token: str) -> dict | None:
+    """The user dict from a valid, unexpired token, else None."""
+    payload, _, assinatura = token.partition(".")
+    # Compared as bytes: compare_digest rejects str with non-ASCII characters
+    if not hmac.compare_digest(_assinatura(payload.encode()).encode(), assinatura.encode()):
+        return None
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:
+        return None
+    if dados.pop("exp", 0) < time.time():
+        return None
+    return dados
+
+
+def restaurar_sessao(session_factory, User, token: str) -> dict | None:
+    """The current user dict for a valid token, or None if the token is invalid or the
+    user was deleted, changed role or had the password changed since it was issued."""
+    dados = ler_token(token)
+    if dados is None:
+        return None
+    db = session_factory()
+    try:
+        user = db.get(User, dados.get("id"))
+        if user is None or user.role != dados.get("role") or user.token_versao != dados.get("token_versao"):
+            return None
+        return _dados_usuario(user)
+    finally:
+        db.close()
+
+
+def _gravar_cookie(valor: str, max_age: int) -> None:
+    """Set (or clear, with max_age=0) the session cookie. Streamlit cannot send
+    Set-Cookie from a script, so a zero-height same-origin component sets it in the page."""
+    components.html(
+        f"<script>window.parent.document.cookie = "
+        f"'{AUTH_COOKIE}={valor}; path=/; max-age={max_age}; SameSite=Strict';</script>",
+        height=0,
+    )
+
+
+def _aplicar_cookie_pendente() -> None:
+    # Written on the run after login/logout, since st.rerun() would drop the component
+    # before the browser ran it
+    if "cookie_pendente" in st.session_state:
+        valor = st.session_state.pop("cookie_pendente")
+        _gravar_cookie(valor, AUTH_TOKEN_TTL if valor else 0)
+
+
+def _usuario_da_sessao(session_factory, User) -> dict | None:
+    """Session user, restored from the session cookie after a browser reload.
+
+    The token never goes in the URL, so links copied from a judge or admin page do not
+    carry a login. Restoring checks the user against the database (restaurar_sessao).
+    """
+    user = st.session_state.get("user")
+    if user:
+        return user
+    # The cookie seen by this session dates from its start; after logout it is stale
+    if st.session_state.get("sessao_encerrada"):
+        return None
+    token = st.context.cookies.get(AUTH_COOKIE)
+    if not token:
+        return None
+    user = restaurar_sessao(session_factory, User, token)
+    if user:
+        st.session_state["user"] = user
+    return user
+
+
+def logout() -> None:
+    st.session_state.pop("user", None)
+    st.session_state["sessao_encerrada"] = True
+    st.session_state["cookie_pendente"] = ""
+
+
 def require_auth(allowed_roles: list[str]) -> dict | None:
     """Check if user is logged in with correct role. Returns user dict or None."""
     user = st.session_state.get("user")
@@ -18,9 +166,14 @@ def require_auth(allowed_roles: list[str]) -> dict | None:
     return None
 
 
-def login_form(db_session, User):
-    """Display login form and authenticate user. Returns True if logged in."""
-    if st.session_state.get("user"):
+def login_form(session_factory, User):
+    """Display login form and authenticate user. Returns True if logged in.
+
+    Authenticated reruns return without touching the database; `session_factory` is
+    only called when the form is submitted or a session token is restored.
+    """
+    _aplicar_cookie_pendente()
+    if _usuario_da_sessao(session_factory, User):
         return True
 
     st.markdown(
@@ -48,13 +201,12 @@ def login_form(db_session, User):
             if not username or not password:
                 st.error("Preencha usuario e senha.")
             else:
-                user = db_session.query(User).filter_by(username=username).first()
-                if user and verify_password(password, user.password_hash):
-                    st.session_state["user"] = {
-                        "id": user.id,
-                        "username": user.username,
-                        "role": user.role,
-                    }
+                with st.spinner("Verificando..."):
+                    user = autenticar(session_factory, User, username, password)
+                if user:
+                    st.session_state["user"] = user
+                    st.session_state.pop("sessao_encerrada", None)
+                    st.session_state["cookie_pendente"] = emitir_token(user)
                     st.rerun()
                 else:
                     st.error("Usuario ou senha incorretos.")
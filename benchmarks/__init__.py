@@ -0,0 +1,4 @@
+"""Benchmarks for the Batalha Olimpica hot paths.
+
+Run from the repository root, e.g. ``python -m benchmarks.indices``.
+"""
@@ -0,0 +1,122 @@
+"""Load test for the read-only leaderboard API.
+
+Each thread keeps one HTTP/1.1 connection open and requests the leaderboard in a loop
+for the given duration. Reports requests per second, latency percentiles and status
+codes. With --etag, clients revalidate with If-None-Match like a polite scraper would.
+
+Usage:
+    uvicorn api:app --port 8600 &
+    python -m benchmarks.carga_api [--url http://127.0.0.1:8600/api/leaderboard]
+                                   [--clientes 16] [--duracao 10] [--etag]
+
+    # or let the script start a local instance on --porta
+    python -m benchmarks.carga_api --iniciar
+"""
+
+import argparse
+import http.client
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def executar(url: str, clientes: int, duracao: float, etag: bool = False) -> dict:
+    partes = urlsplit(url)
+    caminho = partes.path + (f"?{partes.query}" if partes.query else "")
+    latencias: list[float] = []
+    status = Counter()
+    lock = threading.Lock()
+    largada = threading.Barrier(clientes)
+
+    def cliente():
+        conn = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=10)
+        headers = {}
+        minhas: list[float] = []
+        meus = Counter()
+        largada.wait()
+        fim = time.perf_counter() + duracao
+        while (inicio := time.perf_counter()) < fim:
+            conn.request("GET", caminho, headers=headers)
+            resposta = conn.getresponse()
+            resposta.read()
+            minhas.append(time.perf_counter() - inicio)
+            meus[resposta.status] += 1
+            if etag and resposta.getheader("ETag"):
+                headers["If-None-Match"] = resposta.getheader("ETag")
+        conn.close()
+        with lock:
+            latencias.extend(minhas)
+            status.update(meus)
+
+    threads = [threading.Thread(target=cliente) for _ in range(clientes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencias.sort()
+    return {
+        "requisicoes": len(latencias),
+        "req_por_s": len(latencias) / duracao,
+        "p50_ms": _percentil(latencias, 0.50) * 1000,
+        "p95_ms": _percentil(latencias, 0.95) * 1000,
+        "p99_ms": _percentil(latencias, 0.99) * 1000,
+        "status": dict(status),
+    }
+
+
+def _iniciar_servidor(porta: int) -> subprocess.Popen:
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(porta), "--log-level", "warning"]
+    )
+    prazo = time.monotonic() + 15
+    while time.monotonic() < prazo:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", porta, timeout=1)
+            conn.request("GET", "/api/leaderboard")
+            conn.getresponse().read()
+            return processo
+        except OSError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError(f"API nao respondeu na porta {porta}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Padrao: http://127.0.0.1:<porta>/api/leaderboard")
+    parser.add_argument("--porta", type=int, default=8600)
+    parser.add_argument("--clientes", type=int, default=16)
+    parser.add_argument("--duracao", type=float, default=10)
+    parser.add_argument("--etag", action="store_true", help="Revalida com If-None-Match")
+    parser.add_argument("--iniciar", action="store_true", help="Sobe uma instancia local da API")
+    args = parser.parse_args(argv)
+
+    url = args.url or f"http://127.0.0.1:{args.porta}/api/leaderboard"
+    processo = _iniciar_servidor(args.porta) if args.iniciar else None
+    try:
+        r = executar(url, args.clientes, args.duracao, args.etag)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    print(
+        f"{r['requisicoes']} requisicoes em {args.duracao:.0f}s com {args.clientes} clientes: "
+        f"{r['req_por_s']:.0f} req/s, p50 {r['p50_ms']:.2f}ms, p95 {r['p95_ms']:.2f}ms, "
+        f"p99 {r['p99_ms']:.2f}ms, status {r['status']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Attempt-lookup latency as tentativas grows, with and without the declared indexes.
+
+Usage:
+    python -m benchmarks.indices [--tamanhos 10000 50000 100000 200000] [--consultas 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from database import Base, create_db_engine
+from models import Tentativa
+
+LOOKUP = text(
+    "SELECT id, numero, acertou, pontos FROM tentativas "
+    "WHERE equipe_id = :e AND questao_id = :q ORDER BY numero"
+)
+AGREGADO = text("SELECT SUM(pontos) FROM tentativas WHERE equipe_id = :e")
+
+
+def _popular(conn, total: int, n_equipes: int) -> int:
+    """Insert `total` attempts spread over n_equipes; returns the number of questions used."""
+    n_questoes = max(1, total // (n_equipes * 2))
+    linhas = []
+    for questao_id in range(1, n_questoes + 1):
+        for equipe_id in range(1, n_equipes + 1):
+            for numero in (1, 2):
+                acertou = numero == 2
+                linhas.append(
+                    {"e": equipe_id, "q": questao_id, "n": numero, "a": acertou, "p": 80 if acertou else 0}
+                )
+                if len(linhas) >= total:
+                    break
+    conn.execute(
+        text(
+            "INSERT INTO tentativas (equipe_id, questao_id, numero, acertou, pontos, juiz_id) "
+            "VALUES (:e, :q, :n, :a, :p, 1)"
+        ),
+        linhas[:total],
+    )
+    return n_questoes
+
+
+def _medir(conn, stmt, params_list) -> dict:
+    tempos = []
+    for params in params_list:
+        inicio = time.perf_counter()
+        conn.execute(stmt, params).fetchall()
+        tempos.append((time.perf_counter() - inicio) * 1e6)
+    tempos.sort()
+    return {
+        "p50_us": statistics.median(tempos),
+        "p95_us": tempos[int(len(tempos) * 0.95) - 1],
+    }
+
+
+def executar(tamanhos: list[int], consultas: int, n_equipes: int = 100, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    resultados = []
+    for com_indices in (False, True):
+        for total in tamanhos:
+            with tempfile.TemporaryDirectory() as tmp:
+                engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+                Base.metadata.create_all(engine)
+                with engine.begin() as conn:
+                    if not com_indices:
+                        for index in Tentativa.__table__.indexes:
+                            index.drop(conn)
+                    n_questoes = _popular(conn, total, n_equipes)
+                with engine.connect() as conn:
+                    pares = [
+                        {"e": rng.randint(1, n_equipes), "q": rng.randint(1, n_questoes)}
+                        for _ in range(consultas)
+                    ]
+                    lookup = _medir(conn, LOOKUP, pares)
+                    agregado = _medir(conn, AGREGADO, [{"e": p["e"]} for p in pares[: consultas // 10 or 1]])
+                engine.dispose()
+            resultados.append(
+                {
+                    "indices": com_indices,
+                    "tentativas": total,
+                    "lookup_p50_us": round(lookup["p50_us"], 1),
+                    "lookup_p95_us": round(lookup["p95_us"], 1),
+                    "soma_equipe_p50_us": round(agregado["p50_us"], 1),
+                }
+            )
+    return resultados
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 50_000, 100_000, 200_000])
+    parser.add_argument("--consultas", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'indices':>8} {'tentativas':>10} {'lookup p50':>11} {'lookup p95':>11} {'soma p50':>10}  (us)")
+    for r in executar(args.tamanhos, args.consultas):
+        print(
+            f"{'sim' if r['indices'] else 'nao':>8} {r['tentativas']:>10} {r['lookup_p50_us']:>11} "
+            f"{r['lookup_p95_us']:>11} {r['soma_equipe_p50_us']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Scoring benchmark suite over a synthetic tournament.
+
+For each backend (in-memory and file-backed SQLite) a seeded tournament is generated
+and every planned attempt is registered through scoring.registrar_tentativa. The suite
+then times the leaderboard and page-level reads and measures peak Python memory with
+tracemalloc. Results are written as JSON, tagged with the current commit, so two runs
+can be compared:
+
+    python -m benchmarks.pontuacao [--equipes 100] [--regatas 3] [--questoes-por-nivel 20]
+                                   [--repeticoes 50] [--saida resultados.json]
+    python -m benchmarks.pontuacao --comparar antes.json depois.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.torneio import gerar_torneio
+from consultas import carregar_regata_ativa, listar_questoes
+from database import Base, create_db_engine
+from scoring import MotorPontuacao, calcular_leaderboard, calcular_leaderboards, registrar_tentativa
+
+BACKENDS = ("memoria", "arquivo")
+
+
+def _percentis(amostras: list[float]) -> dict:
+    """p50/p95/p99 and mean of samples given in seconds, reported in milliseconds."""
+    ordenadas = sorted(amostras)
+
+    def p(q):
+        return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * q))] * 1000, 3)
+
+    return {"p50_ms": p(0.50), "p95_ms": p(0.95), "p99_ms": p(0.99), "media_ms": round(statistics.fmean(ordenadas) * 1000, 3)}
+
+
+def _cronometrar(funcao, repeticoes: int) -> dict:
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        amostras.append(time.perf_counter() - inicio)
+    return _percentis(amostras)
+
+
+def _pico_memoria_kb(funcao) -> float:
+    tracemalloc.start()
+    try:
+        funcao()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def _engine(backend: str, tmp: str):
+    if backend == "memoria":
+        return create_engine(
+            "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+        )
+    return create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+
+
+def executar_backend(backend: str, equipes: int, regatas: int, questoes_por_nivel: int, repeticoes: int, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _engine(backend, tmp)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, expire_on_commit=False)
+        with Session() as db:
+            torneio = gerar_torneio(db, equipes, regatas, questoes_por_nivel, seed)
+
+            # Registration, one commit per attempt as the judge page does
+            amostras = []
+            inicio_total = time.perf_counter()
+            for equipe_id, questao_id, acertou in torneio.tentativas:
+                inicio = time.perf_counter()
+                registrar_tentativa(db, equipe_id, questao_id, acertou, torneio.juiz_id)
+                amostras.append(time.perf_counter() - inicio)
+            duracao = time.perf_counter() - inicio_total
+            registro = {
+                "tentativas": len(amostras),
+                "por_s": round(len(amostras) / duracao, 1),
+                **_percentis(amostras),
+            }
+
+            regata_ativa = torneio.regata_ids[-1]
+            motor = MotorPontuacao(snapshot_intervalo=10**9)
+            leituras = {
+                "calcular_leaderboard": lambda: calcular_leaderboard(db),
+                "calcular_leaderboards": lambda: calcular_leaderboards(db),
+                "carregar_regata_ativa": lambda: carregar_regata_ativa(db),
+                "listar_questoes": lambda: listar_questoes(db, regata_ativa),
+                "motor_replay": lambda: (motor.reiniciar(), motor.sincronizar(db)),
+            }
+            resultado_leituras = {}
+            for nome, funcao in leituras.items():
+                funcao()  # warm-up
+                resultado_leituras[nome] = {
+                    **_cronometrar(funcao, repeticoes),
+                    "pico_memoria_kb": _pico_memoria_kb(funcao),
+                }
+        engine.dispose()
+
+    return {"registro": registro, "leituras": resultado_leituras}
+
+
+def _commit_atual() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(equipes: int, regatas: int, questoes_por_nivel: int, repeticoes: int, seed: int = 42) -> dict:
+    parametros = {
+        "equipes": equipes,
+        "regatas": regatas,
+        "questoes_por_nivel": questoes_por_nivel,
+        "repeticoes": repeticoes,
+        "seed": seed,
+    }
+    return {
+        "commit": _commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "parametros": parametros,
+        "backends": {
+            backend: executar_backend(backend, equipes, regatas, questoes_por_nivel, repeticoes, seed)
+            for backend in BACKENDS
+        },
+    }
+
+
+def _metricas(resultado: dict) -> dict[str, float]:
+    """Flatten to 'backend.secao.nome.metrica' -> value, for comparisons."""
+    planas = {}
+    for backend, dados in resultado["backends"].items():
+        for metrica, valor in dados["registro"].items():
+            planas[f"{backend}.registro.{metrica}"] = valor
+        for nome, medidas in dados["leituras"].items():
+            for metrica, valor in medidas.items():
+                planas[f"{backend}.leituras.{nome}.{metrica}"] = valor
+    return planas
+
+
+def comparar(antes: dict, depois: dict) -> list[tuple[str, float, float, float]]:
+    """(metric, before, after, % change) for every metric present in both runs."""
+    a, d = _metricas(antes), _metricas(depois)
+    return [
+        (chave, a[chave], d[chave], round((d[chave] - a[chave]) / a[chave] * 100, 1) if a[chave] else 0.0)
+        for chave in a
+        if chave in d
+    ]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--equipes", type=int, default=100)
+    parser.add_argument("--regatas", type=int, default=3)
+    parser.add_argument("--questoes-por-nivel", type=int, default=20)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--saida", help="Arquivo JSON de resultados (padrao: stdout)")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"), help="Compara dois resultados")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        with open(args.comparar[0]) as f_antes, open(args.comparar[1]) as f_depois:
+            linhas = comparar(json.load(f_antes), json.load(f_depois))
+        for chave, antes, depois, variacao in linhas:
+            print(f"{chave:<60} {antes:>12} {depois:>12} {variacao:>+8.1f}%")
+        return
+
+    resultado = executar(args.equipes, args.regatas, args.questoes_por_nivel, args.repeticoes, args.seed)
+    saida = json.dumps(resultado, indent=2)
+    if args.saida:
+        with open(args.saida, "w") as f:
+            f.write(saida + "\n")
+        print(f"Resultados gravados em {args.saida}", file=sys.stderr)
+    else:
+        print(saida)
+
+
+if __name__ == "__main__":
+    main()
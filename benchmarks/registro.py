@@ -0,0 +1,108 @@
+"""Attempt registration throughput under judge contention.
+
+Each thread plays a judge registering attempts through scoring.registrar_tentativa on a
+file-backed database. Reports registrations per second and checks that no attempt
+number was written twice.
+
+Usage:
+    python -m benchmarks.registro [--juizes 8] [--equipes 40] [--questoes 30]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, create_db_engine
+from models import Equipe, Regata, Questao, Tentativa
+from scoring import registrar_tentativa
+
+
+def executar(juizes: int, equipes: int, questoes: int, seed: int = 42) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, expire_on_commit=False)
+        with Session() as db:
+            regata = Regata(nome="Regata", ativa=True)
+            db.add(regata)
+            db.add_all(Equipe(nome=f"Equipe {i}") for i in range(equipes))
+            db.commit()
+            db.add_all(Questao(regata_id=regata.id, nivel="facil", enunciado=f"Q{i}") for i in range(questoes))
+            db.commit()
+            equipe_ids = [e.id for e in db.query(Equipe.id)]
+            questao_ids = [q.id for q in db.query(Questao.id)]
+
+        # Every judge walks the same pairs in a different order, so they collide constantly
+        pares = [(e, q) for e in equipe_ids for q in questao_ids]
+        contagem = {"ok": 0, "rejeitadas": 0}
+        lock = threading.Lock()
+        largada = threading.Barrier(juizes)
+
+        def juiz(juiz_id):
+            ordem = pares[:]
+            random.Random(seed + juiz_id).shuffle(ordem)
+            ok = rejeitadas = 0
+            with Session() as db:
+                largada.wait()
+                for equipe_id, questao_id in ordem:
+                    result = registrar_tentativa(db, equipe_id, questao_id, False, juiz_id)
+                    if "erro" in result:
+                        rejeitadas += 1
+                    else:
+                        ok += 1
+            with lock:
+                contagem["ok"] += ok
+                contagem["rejeitadas"] += rejeitadas
+
+        threads = [threading.Thread(target=juiz, args=(i,)) for i in range(juizes)]
+        inicio = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+
+        with Session() as db:
+            duplicadas = (
+                db.query(Tentativa.equipe_id, Tentativa.questao_id, Tentativa.numero)
+                .group_by(Tentativa.equipe_id, Tentativa.questao_id, Tentativa.numero)
+                .having(func.count() > 1)
+                .count()
+            )
+        engine.dispose()
+
+    total = contagem["ok"] + contagem["rejeitadas"]
+    return {
+        "juizes": juizes,
+        "chamadas": total,
+        "registradas": contagem["ok"],
+        "rejeitadas": contagem["rejeitadas"],
+        "duplicadas": duplicadas,
+        "segundos": round(duracao, 3),
+        "chamadas_por_s": round(total / duracao, 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--juizes", type=int, default=8)
+    parser.add_argument("--equipes", type=int, default=40)
+    parser.add_argument("--questoes", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    r = executar(args.juizes, args.equipes, args.questoes)
+    print(
+        f"{r['juizes']} juizes, {r['chamadas']} chamadas em {r['segundos']}s "
+        f"({r['chamadas_por_s']}/s): {r['registradas']} registradas, "
+        f"{r['rejeitadas']} rejeitadas, {r['duplicadas']} numeros duplicados"
+    )
+
+
+if __name__ == "__main__":
+    main()
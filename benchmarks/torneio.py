@@ -0,0 +1,82 @@
+"""Seeded generator of realistic synthetic tournaments.
+
+Teams have a hidden strength; the chance of a correct answer depends on it and on the
+question level, and teams keep trying (up to 3 attempts) until they get it right. Not
+every team reaches every question. The same seed always yields the same tournament.
+"""
+
+import random
+from dataclasses import dataclass
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models import Equipe, Regata, Questao, User
+
+NIVEIS = ("facil", "medio", "dificil")
+# Base chance of a correct answer per level, for an average team
+ACERTO_BASE = {"facil": 0.75, "medio": 0.5, "dificil": 0.25}
+# Fraction of the questions each team gets to answer
+COBERTURA = 0.8
+
+
+@dataclass
+class Torneio:
+    juiz_id: int
+    equipe_ids: list[int]
+    regata_ids: list[int]
+    # (questao_id, nivel) per regata, in creation order
+    questoes: dict[int, list[tuple[int, str]]]
+    # (equipe_id, questao_id, acertou) in the order a judge would register them
+    tentativas: list[tuple[int, int, bool]]
+
+
+def gerar_torneio(
+    db: Session, equipes: int, regatas: int, questoes_por_nivel: int, seed: int = 42
+) -> Torneio:
+    """Create teams, regatas (the last one active) and questions, and plan the attempts.
+
+    The attempts are returned, not inserted, so callers can time their registration.
+    """
+    rnd = random.Random(seed)
+
+    juiz = User(username=f"juiz-bench-{seed}", password_hash="x", role="juiz")
+    db.add(juiz)
+    db.execute(insert(Equipe), [{"nome": f"Equipe {i:04d}"} for i in range(equipes)])
+    db.execute(insert(Regata), [{"nome": f"Regata {i + 1}", "ativa": i == regatas - 1} for i in range(regatas)])
+    db.commit()
+    juiz_id = juiz.id
+    equipe_ids = [id for (id,) in db.query(Equipe.id).order_by(Equipe.id)]
+    regata_ids = [id for (id,) in db.query(Regata.id).order_by(Regata.id)]
+
+    db.execute(
+        insert(Questao),
+        [
+            {"regata_id": regata_id, "nivel": nivel, "enunciado": f"Questao {nivel} {i} da regata {regata_id}"}
+            for regata_id in regata_ids
+            for nivel in NIVEIS
+            for i in range(questoes_por_nivel)
+        ],
+    )
+    db.commit()
+    questoes: dict[int, list[tuple[int, str]]] = {r: [] for r in regata_ids}
+    for questao_id, regata_id, nivel in db.query(Questao.id, Questao.regata_id, Questao.nivel).order_by(Questao.id):
+        questoes[regata_id].append((questao_id, nivel))
+
+    forca = {e: min(max(rnd.gauss(1.0, 0.35), 0.2), 1.8) for e in equipe_ids}
+    tentativas: list[tuple[int, int, bool]] = []
+    for regata_id in regata_ids:
+        # Attempts arrive interleaved across teams and questions, as during a real regata
+        pendentes = []
+        for equipe_id in equipe_ids:
+            for questao_id, nivel in questoes[regata_id]:
+                if rnd.random() < COBERTURA:
+                    pendentes.append((equipe_id, questao_id, min(ACERTO_BASE[nivel] * forca[equipe_id], 0.97)))
+        rnd.shuffle(pendentes)
+        for equipe_id, questao_id, chance in pendentes:
+            for _ in range(3):
+                acertou = rnd.random() < chance
+                tentativas.append((equipe_id, questao_id, acertou))
+                if acertou:
+                    break
+    return Torneio(juiz_id, equipe_ids, regata_ids, questoes, tentativas)
@@ -0,0 +1,121 @@
+"""Process-wide caches shared by every Streamlit session.
+
+Each cache holds a snapshot (value plus a monotonically increasing version) that is
+only recomputed after a write path calls ``invalidate()``. Viewer reruns read the
+shared snapshot, so database load does not grow with the number of open tabs.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from notificacoes import Canal, placar_alterado, questoes_alteradas
+
+# Seconds before the active-regata snapshot is reloaded even without an invalidation,
+# as a fallback for writes that bypass the admin page
+REGATA_TTL = float(os.environ.get("REGATA_CACHE_TTL", "30"))
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    value: Any
+    # Content fingerprint, when the cache has a digest function; equal digests render the same
+    digest: str | None = None
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class VersionedCache:
+    """Cached value recomputed lazily, at most once per invalidation.
+
+    The version is the sequence of a notification channel, so invalidating also
+    wakes the viewer pages watching that channel.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        canal: Canal | None = None,
+        digest: Callable[[Any], str] | None = None,
+    ):
+        self._loader = loader
+        self._digest = digest
+        self._canal = canal or Canal()
+        self._load_lock = threading.Lock()
+        self._snapshot: Snapshot | None = None
+
+    @property
+    def version(self) -> int:
+        return self._canal.seq
+
+    def invalidate(self) -> int:
+        """Mark the cached value as stale and notify watchers. Returns the new version."""
+        return self._canal.publicar()
+
+    def get(self, max_age: float | None = None) -> Snapshot:
+        """Current snapshot. `max_age` (seconds) also reloads a snapshot that is too old,
+        as a fallback for writes that bypassed invalidate()."""
+        snapshot = self._snapshot
+        if self._fresco(snapshot, self.version, max_age):
+            return snapshot
+
+        with self._load_lock:
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self._snapshot
+            version = self.version
+            if self._fresco(snapshot, version, max_age):
+                return snapshot
+            # A write during the load bumps the version, so the next get() reloads
+            value = self._loader()
+            digest = self._digest(value) if self._digest else None
+            snapshot = Snapshot(version=version, value=value, digest=digest)
+            self._snapshot = snapshot
+            return snapshot
+
+    @staticmethod
+    def _fresco(snapshot: Snapshot | None, version: int, max_age: float | None) -> bool:
+        if snapshot is None or snapshot.version != version:
+            return False
+        return max_age is None or time.monotonic() - snapshot.loaded_at < max_age
+
+
+def _carregar_leaderboard() -> dict:
+    # Import here to avoid circular imports (scoring invalidates this cache)
+    from database import get_db
+    from scoring import calcular_leaderboards
+
+    db = get_db()
+    try:
+        return calcular_leaderboards(db)
+    finally:
+        db.close()
+
+
+def _digest_ranking(leaderboards) -> str:
+    """Content digest of a snapshot value (any value with a deterministic repr)."""
+    chave = repr(leaderboards)
+    return hashlib.blake2b(chave.encode(), digest_size=12).hexdigest()
+
+
+# All standings (see scoring.calcular_leaderboards). Invalidated by scoring writes, team
+# CRUD and regata/question changes that move points between views.
+leaderboard_cache = VersionedCache(_carregar_leaderboard, canal=placar_alterado, digest=_digest_ranking)
+
+
+def _carregar_regata_ativa():
+    from database import get_db
+    from consultas import carregar_regata_ativa
+
+    db = get_db()
+    try:
+        return carregar_regata_ativa(db)
+    finally:
+        db.close()
+
+
+# Active regata and its questions (consultas.RegataAtiva, or None). Invalidated by every
+# admin action that publishes on questoes_alteradas (activate/stop, question CRUD).
+regata_cache = VersionedCache(_carregar_regata_ativa, canal=questoes_alteradas, digest=_digest_ranking)
@@ -0,0 +1,80 @@
+"""Column-scoped queries used by the pages.
+
+``Questao.enunciado`` and the legacy ``Questao.imagem`` BLOB are deferred on the model, so
+a plain ``db.query(Questao)`` only loads the light columns. These helpers ask for exactly
+what each view needs, keeping per-rerun memory and I/O independent of statement and
+image sizes.
+"""
+
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session, undefer
+
+from models import Questao, Regata
+
+ROTULO_MAX = 30
+
+
+class QuestaoResumo(NamedTuple):
+    id: int
+    nivel: str
+    rotulo: str
+
+
+class QuestaoCartao(NamedTuple):
+    id: int
+    nivel: str
+    enunciado: str
+    imagem_hash: str | None
+    imagem_mime: str | None
+
+
+class RegataAtiva(NamedTuple):
+    """Immutable view of the active regata, safe to share between sessions."""
+
+    id: int
+    nome: str
+    questoes: tuple[QuestaoCartao, ...]
+    resumo: tuple[QuestaoResumo, ...]
+
+
+def _rotulo(filename: str | None, enunciado: str) -> str:
+    inicio = enunciado[:ROTULO_MAX] if enunciado else ""
+    return (filename or inicio) if inicio else "Sem titulo"
+
+
+def carregar_regata_ativa(db: Session) -> RegataAtiva | None:
+    """The active regata with its question cards and selectbox labels, in two queries."""
+    regata = db.query(Regata.id, Regata.nome).filter(Regata.ativa == True).first()  # noqa: E712
+    if regata is None:
+        return None
+    rows = (
+        db.query(
+            Questao.id,
+            Questao.nivel,
+            Questao.enunciado,
+            Questao.imagem_filename,
+            Questao.imagem_hash,
+            Questao.imagem_mime,
+        )
+        .filter(Questao.regata_id == regata.id)
+        .order_by(Questao.id)
+        .all()
+    )
+    return RegataAtiva(
+        regata.id,
+        regata.nome,
+        tuple(QuestaoCartao(id, nivel, enunciado, hash_, mime) for id, nivel, enunciado, _, hash_, mime in rows),
+        tuple(QuestaoResumo(id, nivel, _rotulo(filename, enunciado)) for id, nivel, enunciado, filename, _, _ in rows),
+    )
+
+
+def listar_questoes(db: Session, regata_id: int) -> list[Questao]:
+    """Questions with their statement loaded, for cards. The legacy BLOB stays deferred."""
+    return (
+        db.query(Questao)
+        .options(undefer(Questao.enunciado))
+        .filter(Questao.regata_id == regata_id)
+        .order_by(Questao.id)
+        .all()
+    )
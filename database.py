@@ -1,11 +1,87 @@
 import os
-from sqlalchemy import create_engine, inspect, text
+import time
+import warnings
+from typing import Callable
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.db")
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Connection pool and SQLite tuning (override through environment variables)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", "20000"))
+DB_MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+
+def _configurar_sqlite(dbapi_connection, connection_record):
+    """Apply pragmas on every new pooled connection.
+
+    WAL lets leaderboard readers run while a judge commits, and busy_timeout makes
+    concurrent writers wait for the lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    cursor.close()
+
+
+# Called as observador(statement, seconds) after every statement on an observed engine;
+# sessao.py and diagnostico.py attribute the statements to the running page
+observadores_consulta: list[Callable[[str, float], None]] = []
+
+
+def _antes_consulta(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+
+def _depois_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_consulta")
+    if inicios:
+        duracao = time.perf_counter() - inicios.pop()
+        for observador in observadores_consulta:
+            observador(statement, duracao)
+
+
+def _erro_consulta(contexto):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    if contexto.connection is not None and contexto.connection.info.get("inicio_consulta"):
+        contexto.connection.info["inicio_consulta"].pop()
+
+
+def observar_consultas(alvo) -> None:
+    """Time every statement run on `alvo` (an engine) and report it to observadores_consulta."""
+    if not event.contains(alvo, "before_cursor_execute", _antes_consulta):
+        event.listen(alvo, "before_cursor_execute", _antes_consulta)
+        event.listen(alvo, "after_cursor_execute", _depois_consulta)
+        event.listen(alvo, "handle_error", _erro_consulta)
+
+
+def create_db_engine(url: str = DATABASE_URL):
+    """Create a file-backed SQLite engine with a bounded pool and tuned pragmas."""
+    new_engine = create_engine(
+        url,
+        # Pooled connections are handed to whichever Streamlit script thread asks
+        connect_args={"check_same_thread": False, "timeout": DB_BUSY_TIMEOUT_MS / 1000},
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    event.listen(new_engine, "connect", _configurar_sqlite)
+    observar_consultas(new_engine)
+    return new_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
 
@@ -24,9 +100,12 @@ def init_db():
     _initialized = True
 
     # Import here to avoid circular imports
-    from models import User
+    from models import User, Tentativa
     from auth import hash_password
+    from scoring import reconstruir_placar, semear_eventos
+    from imagens import migrar_blobs
 
+    tabelas_existentes = inspect(engine).get_table_names()
     Base.metadata.create_all(bind=engine)
 
     # Migrate: add enunciado column if missing (for existing databases)
@@ -37,6 +116,25 @@ def init_db():
             conn.execute(text("ALTER TABLE questoes ADD COLUMN enunciado TEXT DEFAULT ''"))
             conn.commit()
 
+    # Migrate: add image metadata columns and move BLOBs to the file store (for existing databases)
+    colunas_imagem = {
+        "imagem_hash": "VARCHAR(64)",
+        "imagem_mime": "VARCHAR(50)",
+        "imagem_tamanho": "INTEGER",
+        "imagem_largura": "INTEGER",
+        "imagem_altura": "INTEGER",
+    }
+    with engine.begin() as conn:
+        for nome, tipo in colunas_imagem.items():
+            if nome not in columns:
+                conn.execute(text(f"ALTER TABLE questoes ADD COLUMN {nome} {tipo}"))
+        migrar_blobs(conn)
+
+    # Migrate: add users.token_versao (for existing databases)
+    if "token_versao" not in [c["name"] for c in inspector.get_columns("users")]:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE users ADD COLUMN token_versao INTEGER NOT NULL DEFAULT 0"))
+
     # Migrate: remove FK constraint on juiz_id in tentativas (for existing databases)
     if "tentativas" in inspector.get_table_names():
         fks = inspector.get_foreign_keys("tentativas")
@@ -63,6 +161,15 @@ def init_db():
                 conn.execute(text("ALTER TABLE tentativas_new RENAME TO tentativas"))
                 conn.commit()
 
+    # Migrate: add tentativas indexes (for existing databases; the rebuild above drops them)
+    for index in Tentativa.__table__.indexes:
+        try:
+            index.create(bind=engine, checkfirst=True)
+        except IntegrityError:
+            warnings.warn(
+                f"Nao foi possivel criar {index.name}: existem tentativas com numero duplicado."
+            )
+
     # Create default admin if not exists
     db = SessionLocal()
     try:
@@ -75,6 +182,14 @@ def init_db():
             )
             db.add(admin)
             db.commit()
+
+        # Migrate: fill the materialized placar from tentativas (for existing databases)
+        if "placar" not in tabelas_existentes:
+            reconstruir_placar(db)
+
+        # Migrate: seed the scoring event log from tentativas (for existing databases)
+        if "eventos_pontuacao" not in tabelas_existentes:
+            semear_eventos(db)
     finally:
         db.close()
 
@@ -0,0 +1,243 @@
+"""Per-page rerun diagnostics: SQL counts, database and render time, slow queries.
+
+app.py runs every page inside ``medir_pagina(nome)``. Each rerun records the number
+of statements, the time spent in the database (from the engine hooks in database.py)
+and the total script time, aggregated per page and per browser session; the latest
+reruns are also listed one by one. Statements slower than ``DIAG_CONSULTA_LENTA_MS``
+go to a bounded slow-query log. The counters live in this
+process only; the admin page shows them and ``despejar()`` writes them to a JSON file.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import NamedTuple
+
+from database import observadores_consulta
+
+# Reruns kept per page for the percentiles
+DIAG_AMOSTRAS = int(os.environ.get("DIAG_AMOSTRAS", "1000"))
+# Statements at or above this duration are logged as slow
+DIAG_CONSULTA_LENTA_MS = float(os.environ.get("DIAG_CONSULTA_LENTA_MS", "100"))
+# Slow statements kept (most recent)
+DIAG_LENTAS = int(os.environ.get("DIAG_LENTAS", "200"))
+# Browser sessions tracked (least recently seen are dropped)
+DIAG_SESSOES = int(os.environ.get("DIAG_SESSOES", "500"))
+# Directory for despejar() dumps
+DIAG_DIR = os.environ.get(
+    "DIAG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "diagnosticos")
+)
+
+
+@dataclass
+class Medicao:
+    """One page rerun."""
+
+    pagina: str
+    sessao: str | None
+    inicio: float = field(default_factory=time.time)
+    consultas: int = 0
+    tempo_db: float = 0.0
+    tempo_total: float = 0.0
+
+
+class ConsultaLenta(NamedTuple):
+    quando: str
+    pagina: str | None
+    sessao: str | None
+    ms: float
+    sql: str
+
+
+def percentil(valores: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..1) of a non-empty list."""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * q))]
+
+
+def _percentis(valores: list[float], escala: float = 1.0) -> dict:
+    return {f"p{int(q * 100)}": round(percentil(valores, q) * escala, 2) for q in (0.50, 0.95, 0.99)}
+
+
+def _por_minuto(inicios: list[float]) -> float:
+    if len(inicios) < 2 or inicios[-1] == inicios[0]:
+        return 0.0
+    return round((len(inicios) - 1) / (inicios[-1] - inicios[0]) * 60, 2)
+
+
+class Diagnostico:
+    """Thread-safe aggregate of page reruns and slow statements."""
+
+    def __init__(
+        self,
+        amostras: int = DIAG_AMOSTRAS,
+        lentas: int = DIAG_LENTAS,
+        sessoes: int = DIAG_SESSOES,
+        limiar_ms: float = DIAG_CONSULTA_LENTA_MS,
+    ):
+        self.limiar_ms = limiar_ms
+        self._max_amostras = amostras
+        self._max_sessoes = sessoes
+        self._lock = threading.Lock()
+        self._paginas: dict[str, deque[Medicao]] = {}
+        self._reruns: dict[str, int] = {}
+        self._sessoes: OrderedDict[str, dict] = OrderedDict()
+        self._lentas: deque[ConsultaLenta] = deque(maxlen=lentas)
+        self._desde = time.time()
+
+    def registrar(self, medicao: Medicao) -> None:
+        with self._lock:
+            amostras = self._paginas.setdefault(medicao.pagina, deque(maxlen=self._max_amostras))
+            amostras.append(medicao)
+            self._reruns[medicao.pagina] = self._reruns.get(medicao.pagina, 0) + 1
+            if medicao.sessao is None:
+                return
+            sessao = self._sessoes.pop(medicao.sessao, None) or {
+                "reruns": 0,
+                "consultas": 0,
+                "tempo_db": 0.0,
+                "tempo_total": 0.0,
+                "primeiro": medicao.inicio,
+                "paginas": {},
+            }
+            sessao["reruns"] += 1
+            sessao["consultas"] += medicao.consultas
+            sessao["tempo_db"] += medicao.tempo_db
+            sessao["tempo_total"] += medicao.tempo_total
+            sessao["ultimo"] = medicao.inicio
+            sessao["paginas"][medicao.pagina] = sessao["paginas"].get(medicao.pagina, 0) + 1
+            self._sessoes[medicao.sessao] = sessao
+            if len(self._sessoes) > self._max_sessoes:
+                self._sessoes.popitem(last=False)
+
+    def registrar_consulta(self, medicao: Medicao | None, sql: str, duracao: float) -> None:
+        ms = duracao * 1000
+        if ms < self.limiar_ms:
+            return
+        lenta = ConsultaLenta(
+            datetime.now().isoformat(timespec="seconds"),
+            medicao.pagina if medicao else None,
+            medicao.sessao if medicao else None,
+            round(ms, 2),
+            sql,
+        )
+        with self._lock:
+            self._lentas.append(lenta)
+
+    def por_pagina(self) -> list[dict]:
+        with self._lock:
+            paginas = {nome: list(amostras) for nome, amostras in self._paginas.items()}
+            reruns = dict(self._reruns)
+        linhas = []
+        for nome, amostras in sorted(paginas.items()):
+            linhas.append({
+                "pagina": nome,
+                "reruns": reruns[nome],
+                "reruns_por_min": _por_minuto([m.inicio for m in amostras]),
+                "consultas": _percentis([m.consultas for m in amostras]),
+                "db_ms": _percentis([m.tempo_db for m in amostras], 1000),
+                "total_ms": _percentis([m.tempo_total for m in amostras], 1000),
+            })
+        return linhas
+
+    def por_sessao(self) -> list[dict]:
+        with self._lock:
+            sessoes = [(id, dict(dados, paginas=dict(dados["paginas"]))) for id, dados in self._sessoes.items()]
+        linhas = []
+        for id, dados in reversed(sessoes):
+            duracao = dados["ultimo"] - dados["primeiro"]
+            linhas.append({
+                "sessao": id,
+                "reruns": dados["reruns"],
+                "reruns_por_min": round((dados["reruns"] - 1) / duracao * 60, 2) if duracao else 0.0,
+                "consultas": dados["consultas"],
+                "db_ms": round(dados["tempo_db"] * 1000, 2),
+                "total_ms": round(dados["tempo_total"] * 1000, 2),
+                "paginas": dados["paginas"],
+            })
+        return linhas
+
+    def recentes(self, n: int = 50) -> list[Medicao]:
+        """The last `n` reruns across all pages, most recent first."""
+        with self._lock:
+            medicoes = [m for amostras in self._paginas.values() for m in amostras]
+        return sorted(medicoes, key=lambda m: m.inicio, reverse=True)[:n]
+
+    def lentas(self) -> list[ConsultaLenta]:
+        """Slow statements, most recent first."""
+        with self._lock:
+            return list(reversed(self._lentas))
+
+    def resumo(self) -> dict:
+        return {
+            "desde": datetime.fromtimestamp(self._desde).isoformat(timespec="seconds"),
+            "limiar_ms": self.limiar_ms,
+            "paginas": self.por_pagina(),
+            "sessoes": self.por_sessao(),
+            "lentas": [l._asdict() for l in self.lentas()],
+        }
+
+    def amostras(self) -> dict[str, list[dict]]:
+        """Raw per-rerun samples, for offline analysis."""
+        with self._lock:
+            return {nome: [asdict(m) for m in amostras] for nome, amostras in self._paginas.items()}
+
+    def despejar(self, caminho: str | None = None) -> str:
+        """Write the summary and raw samples as JSON. Returns the file path."""
+        if caminho is None:
+            os.makedirs(DIAG_DIR, exist_ok=True)
+            caminho = os.path.join(DIAG_DIR, f"diagnostico-{datetime.now():%Y%m%d-%H%M%S}.json")
+        with open(caminho, "w") as f:
+            json.dump({**self.resumo(), "amostras": self.amostras()}, f, indent=2)
+        return caminho
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._paginas.clear()
+            self._reruns.clear()
+            self._sessoes.clear()
+            self._lentas.clear()
+            self._desde = time.time()
+
+
+diagnostico = Diagnostico()
+
+_medicao: contextvars.ContextVar[Medicao | None] = contextvars.ContextVar("medicao", default=None)
+
+
+def _id_sessao() -> str | None:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+@contextlib.contextmanager
+def medir_pagina(nome: str):
+    """Record one rerun of page `nome`, also when it ends with st.stop() or st.rerun()."""
+    medicao = Medicao(nome, _id_sessao())
+    token = _medicao.set(medicao)
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        medicao.tempo_total = time.perf_counter() - inicio
+        _medicao.reset(token)
+        diagnostico.registrar(medicao)
+
+
+def _observar(statement: str, duracao: float) -> None:
+    medicao = _medicao.get()
+    if medicao is not None:
+        medicao.consultas += 1
+        medicao.tempo_db += duracao
+    diagnostico.registrar_consulta(medicao, statement, duracao)
+
+
+observadores_consulta.append(_observar)
@@ -0,0 +1,108 @@
+// Leaderboard bars. Receives the ranking as compact JSON ([[equipe, pontos, posicao], ...])
+// through Streamlit's component messages and animates widths and row order in place.
+(function () {
+  "use strict";
+
+  // Color palette — vibrant, high contrast (by row order)
+  var CORES = [
+    "#ffd200", "#00e5ff", "#ff3d00", "#76ff03",
+    "#d500f9", "#ffab00", "#00e676", "#ff1744",
+    "#2979ff", "#f50057", "#00bfa5", "#ff6d00",
+    "#651fff", "#c6ff00", "#ff9100", "#00b8d4",
+    "#dd2c00", "#aeea00", "#304ffe", "#64dd17",
+  ];
+  // Top 3 get a medal and a taller bar
+  var MEDALHAS = { 1: "🥇", 2: "🥈", 3: "🥉" };
+  var ALTURAS = { 1: 52, 2: 44, 3: 40 };
+  var ALTURA_PADRAO = 36;
+  // Row padding (6px top and bottom) plus the gap between rows
+  var EXTRA_LINHA = 18;
+
+  var placar = document.getElementById("placar");
+  var linhas = {};  // equipe -> row elements, kept across renders so changes animate
+  var ultimo = null;
+
+  function enviar(tipo, dados) {
+    var mensagem = { isStreamlitMessage: true, type: tipo };
+    for (var k in dados) mensagem[k] = dados[k];
+    window.parent.postMessage(mensagem, "*");
+  }
+
+  function criarLinha(equipe) {
+    var linha = document.createElement("div");
+    linha.className = "linha";
+    linha.innerHTML =
+      '<div class="posicao"></div><div class="equipe"></div>' +
+      '<div class="trilho"><div class="barra" style="width:0"></div></div>';
+    var elementos = {
+      linha: linha,
+      posicao: linha.children[0],
+      equipe: linha.children[1],
+      trilho: linha.children[2],
+      barra: linha.children[2].firstChild,
+    };
+    placar.appendChild(linha);
+    return elementos;
+  }
+
+  function desenhar(ranking) {
+    var maximo = 1;
+    ranking.forEach(function (item) { if (item[1] > maximo) maximo = item[1]; });
+
+    var vistos = {};
+    var topo = 0;
+    ranking.forEach(function (item, i) {
+      var equipe = item[0], pontos = item[1], posicao = item[2];
+      var l = linhas[equipe];
+      var nova = !l;
+      if (nova) l = linhas[equipe] = criarLinha(equipe);
+      vistos[equipe] = true;
+
+      var altura = ALTURAS[posicao] || ALTURA_PADRAO;
+      var cor = CORES[i % CORES.length];
+      // Minimum bar width so the points stay visible
+      var largura = pontos > 0 ? Math.max((pontos / maximo) * 100, 8) : 2;
+
+      l.linha.className = "linha" + (posicao <= 3 ? " p" + posicao : "");
+      if (nova) {
+        // Enter at the final position without sliding in from the top
+        l.linha.style.transition = "none";
+        l.linha.style.transform = "translateY(" + topo + "px)";
+        l.linha.offsetHeight;  // flush, so the transition is restored for later moves
+        l.linha.style.transition = "";
+      } else {
+        l.linha.style.transform = "translateY(" + topo + "px)";
+      }
+      l.posicao.textContent = posicao;
+      l.equipe.textContent = (MEDALHAS[posicao] ? MEDALHAS[posicao] + " " : "") + equipe;
+      l.trilho.style.height = altura + "px";
+      l.barra.style.background = "linear-gradient(90deg," + cor + "," + cor + "dd)";
+      l.barra.textContent = pontos;
+      // Next frame, so new rows grow from zero
+      requestAnimationFrame(function () { l.barra.style.width = largura + "%"; });
+
+      topo += altura + EXTRA_LINHA;
+    });
+
+    Object.keys(linhas).forEach(function (equipe) {
+      if (!vistos[equipe]) {
+        placar.removeChild(linhas[equipe].linha);
+        delete linhas[equipe];
+      }
+    });
+
+    placar.style.height = topo + "px";
+    enviar("streamlit:setFrameHeight", { height: topo });
+  }
+
+  window.addEventListener("message", function (evento) {
+    var dados = evento.data;
+    if (!dados || dados.type !== "streamlit:render") return;
+    // The same JSON string is re-sent on unrelated reruns; nothing to redraw then
+    if (dados.args.dados === ultimo) return;
+    ultimo = dados.args.dados;
+    desenhar(JSON.parse(ultimo));
+  });
+
+  enviar("streamlit:componentReady", { apiVersion: 1 });
+})();
@@ -0,0 +1,158 @@
+"""Content-addressed file store for question images.
+
+Image bytes live on disk under ``static/imagens/<sha256>.<ext>``. The questoes table only
+keeps the hash, size, MIME type and dimensions, so listing questions never reads image
+bytes. Files are served by Streamlit's static file server (``server.enableStaticServing``),
+and since the name is the content hash, browsers can cache them indefinitely.
+
+Uploads go through ``processar_upload``: EXIF orientation applied, metadata dropped,
+dimensions capped and re-encoded as WebP, plus a small thumbnail for the admin list.
+"""
+
+import hashlib
+import io
+import os
+import warnings
+
+from PIL import Image, ImageOps
+from sqlalchemy import text
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGENS_DIR = os.path.join(BASE_DIR, "static", "imagens")
+# Relative URL under which Streamlit serves the static/ directory
+IMAGENS_URL = "app/static/imagens"
+
+FORMATOS = {"PNG", "JPEG", "GIF", "WEBP"}
+
+# Upload normalization (override through environment variables)
+IMAGEM_LADO_MAX = int(os.environ.get("IMAGEM_LADO_MAX", "1600"))
+MINIATURA_LADO = int(os.environ.get("IMAGEM_MINIATURA_LADO", "300"))
+WEBP_QUALIDADE = int(os.environ.get("IMAGEM_WEBP_QUALIDADE", "82"))
+
+
+def _extensao(mime: str) -> str:
+    return mime.split("/", 1)[1].replace("jpeg", "jpg")
+
+
+def caminho_imagem(imagem_hash: str, mime: str) -> str:
+    return os.path.join(IMAGENS_DIR, f"{imagem_hash}.{_extensao(mime)}")
+
+
+def caminho_miniatura(imagem_hash: str) -> str:
+    return os.path.join(IMAGENS_DIR, f"{imagem_hash}.thumb.webp")
+
+
+def url_imagem(imagem_hash: str, mime: str) -> str:
+    return f"{IMAGENS_URL}/{imagem_hash}.{_extensao(mime)}"
+
+
+def url_miniatura(imagem_hash: str, mime: str) -> str:
+    """Thumbnail URL, generating it first for images stored before thumbnails existed."""
+    if not os.path.exists(caminho_miniatura(imagem_hash)):
+        try:
+            with Image.open(caminho_imagem(imagem_hash, mime)) as img:
+                _gravar(caminho_miniatura(imagem_hash), _miniatura(img))
+        except OSError:
+            return url_imagem(imagem_hash, mime)
+    return f"{IMAGENS_URL}/{imagem_hash}.thumb.webp"
+
+
+def _gravar(caminho: str, dados: bytes) -> None:
+    if os.path.exists(caminho):
+        return
+    os.makedirs(IMAGENS_DIR, exist_ok=True)
+    # Write-then-rename so a concurrent reader never sees a partial file
+    tmp = f"{caminho}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(dados)
+    os.replace(tmp, caminho)
+
+
+def _webp(img: Image.Image) -> bytes:
+    # Re-encoding without passing exif/icc drops all metadata
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+    buf = io.BytesIO()
+    img.save(buf, format="WEBP", quality=WEBP_QUALIDADE, method=6)
+    return buf.getvalue()
+
+
+def _miniatura(img: Image.Image) -> bytes:
+    miniatura = img.copy()
+    miniatura.thumbnail((MINIATURA_LADO, MINIATURA_LADO), Image.LANCZOS)
+    return _webp(miniatura)
+
+
+def salvar_imagem(dados: bytes) -> dict:
+    """Store image bytes as-is by content hash. Returns the metadata kept in the table."""
+    with Image.open(io.BytesIO(dados)) as img:
+        formato = img.format
+        largura, altura = img.size
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de imagem nao suportado: {formato}")
+
+    mime = Image.MIME[formato]
+    imagem_hash = hashlib.sha256(dados).hexdigest()
+    _gravar(caminho_imagem(imagem_hash, mime), dados)
+
+    return {
+        "imagem_hash": imagem_hash,
+        "imagem_mime": mime,
+        "imagem_tamanho": len(dados),
+        "imagem_largura": largura,
+        "imagem_altura": altura,
+    }
+
+
+def processar_upload(dados: bytes) -> dict:
+    """Normalize an uploaded image and store the display and thumbnail variants.
+
+    The display variant is capped at IMAGEM_LADO_MAX px and WebP-encoded, so every
+    spectator downloads a phone-sized file instead of the camera original.
+    """
+    with Image.open(io.BytesIO(dados)) as original:
+        if original.format not in FORMATOS:
+            raise ValueError(f"Formato de imagem nao suportado: {original.format}")
+        img = ImageOps.exif_transpose(original)
+        img.thumbnail((IMAGEM_LADO_MAX, IMAGEM_LADO_MAX), Image.LANCZOS)
+        exibicao = _webp(img)
+        miniatura = _miniatura(img)
+
+    meta = salvar_imagem(exibicao)
+    _gravar(caminho_miniatura(meta["imagem_hash"]), miniatura)
+    return meta
+
+
+def ler_imagem(imagem_hash: str, mime: str) -> bytes:
+    with open(caminho_imagem(imagem_hash, mime), "rb") as f:
+        return f.read()
+
+
+def migrar_blobs(conn) -> int:
+    """Move legacy questoes.imagem BLOBs to the file store. Returns how many were moved."""
+    movidas = 0
+    pendentes = conn.execute(
+        text("SELECT id FROM questoes WHERE imagem IS NOT NULL AND imagem_hash IS NULL")
+    ).scalars().all()
+
+    # One row at a time, so only a single BLOB is in memory
+    for questao_id in pendentes:
+        dados = conn.execute(
+            text("SELECT imagem FROM questoes WHERE id = :id"), {"id": questao_id}
+        ).scalar()
+        try:
+            meta = processar_upload(dados)
+        except (OSError, ValueError):
+            warnings.warn(f"Imagem da questao {questao_id} invalida; mantida no banco.")
+            continue
+        conn.execute(
+            text(
+                "UPDATE questoes SET imagem = NULL, imagem_hash = :imagem_hash, "
+                "imagem_mime = :imagem_mime, imagem_tamanho = :imagem_tamanho, "
+                "imagem_largura = :imagem_largura, imagem_altura = :imagem_altura "
+                "WHERE id = :id"
+            ),
+            {**meta, "id": questao_id},
+        )
+        movidas += 1
+    return movidas
@@ -0,0 +1,112 @@
+"""Maintenance commands for the Batalha Olimpica database.
+
+Usage:
+    python manage.py placar verificar
+    python manage.py placar reconstruir
+    python manage.py eventos verificar
+    python manage.py pontos recalcular [--regras arquivo.json] [--simular]
+"""
+
+import argparse
+import sys
+import time
+
+from database import get_db
+from regras import carregar_regras, regras_atuais
+from scoring import verificar_placar, reconstruir_placar, verificar_eventos, recalcular_pontos
+
+
+def _imprimir_divergencias(divergencias: list[dict]) -> None:
+    for d in divergencias:
+        print(
+            f"  equipe {d['equipe_id']}: placar={d['placar']} "
+            f"tentativas={d['tentativas']} (diferenca {d['placar'] - d['tentativas']:+d})"
+        )
+
+
+def cmd_placar(args) -> int:
+    db = get_db()
+    try:
+        if args.acao == "verificar":
+            divergencias = verificar_placar(db)
+            if not divergencias:
+                print("Placar consistente com as tentativas.")
+                return 0
+            print(f"{len(divergencias)} equipe(s) com placar divergente:")
+            _imprimir_divergencias(divergencias)
+            return 1
+
+        divergencias = reconstruir_placar(db)
+        if divergencias:
+            print(f"Placar reconstruido. {len(divergencias)} divergencia(s) corrigida(s):")
+            _imprimir_divergencias(divergencias)
+        else:
+            print("Placar reconstruido. Nenhuma divergencia encontrada.")
+        return 0
+    finally:
+        db.close()
+
+
+def cmd_eventos(args) -> int:
+    db = get_db()
+    try:
+        divergencias = verificar_eventos(db)
+        if not divergencias:
+            print("Log de eventos consistente com o placar.")
+            return 0
+        print(f"{len(divergencias)} equipe(s) com placar divergente do log de eventos:")
+        for d in divergencias:
+            print(f"  equipe {d['equipe_id']}: placar={d['placar']} eventos={d['eventos']}")
+        return 1
+    finally:
+        db.close()
+
+
+def cmd_pontos(args) -> int:
+    regras = carregar_regras(args.regras) if args.regras else regras_atuais()
+    db = get_db()
+    try:
+        inicio = time.perf_counter()
+        resultado = recalcular_pontos(db, regras, simular=args.simular)
+        duracao = time.perf_counter() - inicio
+    finally:
+        db.close()
+
+    antes, depois = resultado["antes"], resultado["depois"]
+    for equipe_id in sorted(set(antes) | set(depois)):
+        a, d = antes.get(equipe_id, 0), depois.get(equipe_id, 0)
+        if a != d:
+            print(f"  equipe {equipe_id}: {a} -> {d} ({d - a:+d})")
+    total_antes, total_depois = sum(antes.values()), sum(depois.values())
+    prefixo = "Simulacao: " if args.simular else ""
+    print(
+        f"{prefixo}{resultado['alteradas']} tentativa(s) alterada(s) em {duracao:.2f}s. "
+        f"Total {total_antes} -> {total_depois}."
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Comandos de manutencao da Batalha Olimpica")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_placar = sub.add_parser("placar", help="Verifica ou reconstroi o placar materializado")
+    p_placar.add_argument("acao", choices=["verificar", "reconstruir"])
+    p_placar.set_defaults(func=cmd_placar)
+
+    p_eventos = sub.add_parser("eventos", help="Reprocessa o log de eventos e compara com o placar")
+    p_eventos.add_argument("acao", choices=["verificar"])
+    p_eventos.set_defaults(func=cmd_eventos)
+
+    p_pontos = sub.add_parser("pontos", help="Recalcula os pontos de todas as tentativas com as regras atuais")
+    p_pontos.add_argument("acao", choices=["recalcular"])
+    p_pontos.add_argument("--regras", help="Arquivo JSON de regras (padrao: REGRAS_PONTUACAO)")
+    p_pontos.add_argument("--simular", action="store_true", help="Mostra o resultado sem gravar")
+    p_pontos.set_defaults(func=cmd_pontos)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
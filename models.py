@@ -8,8 +8,9 @@ from sqlalchemy import (
     LargeBinary,
     DateTime,
     ForeignKey,
+    Index,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from database import Base
 
 
@@ -20,6 +21,8 @@ class User(Base):
     username = Column(String(50), unique=True, nullable=False)
     password_hash = Column(String(128), nullable=False)
     role = Column(String(10), nullable=False)  # "admin" or "juiz"
+    # Bumped on password change; session tokens issued with an older value are rejected
+    token_versao = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
 
@@ -32,6 +35,7 @@ class Equipe(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     tentativas = relationship("Tentativa", back_populates="equipe")
+    placar = relationship("Placar", back_populates="equipe", uselist=False, cascade="all, delete-orphan")
 
 
 class Regata(Base):
@@ -51,9 +55,16 @@ class Questao(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     regata_id = Column(Integer, ForeignKey("regatas.id"), nullable=False)
     nivel = Column(String(10), nullable=False)  # "facil", "medio", "dificil"
-    enunciado = Column(Text, nullable=False)
-    imagem = Column(LargeBinary, nullable=True)
+    # Heavy columns are deferred; see consultas.py for the per-view column sets
+    enunciado = deferred(Column(Text, nullable=False))
+    imagem = deferred(Column(LargeBinary, nullable=True))  # legacy; moved to the file store by init_db
     imagem_filename = Column(String(255), nullable=True)
+    # Image bytes live in imagens.py's content-addressed store
+    imagem_hash = Column(String(64), nullable=True)
+    imagem_mime = Column(String(50), nullable=True)
+    imagem_tamanho = Column(Integer, nullable=True)
+    imagem_largura = Column(Integer, nullable=True)
+    imagem_altura = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     regata = relationship("Regata", back_populates="questoes")
@@ -62,6 +73,12 @@ class Questao(Base):
 
 class Tentativa(Base):
     __tablename__ = "tentativas"
+    __table_args__ = (
+        # Attempt lookup by (equipe, questao) ordered by numero; also forbids duplicate numbers
+        Index("uq_tentativas_equipe_questao_numero", "equipe_id", "questao_id", "numero", unique=True),
+        # Covering index for per-team point aggregation
+        Index("ix_tentativas_equipe_pontos", "equipe_id", "pontos"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     equipe_id = Column(Integer, ForeignKey("equipes.id"), nullable=False)
@@ -74,3 +91,43 @@ class Tentativa(Base):
 
     equipe = relationship("Equipe", back_populates="tentativas")
     questao = relationship("Questao", back_populates="tentativas")
+
+
+class Placar(Base):
+    """Materialized per-team total, kept in sync by scoring on every write."""
+
+    __tablename__ = "placar"
+
+    equipe_id = Column(Integer, ForeignKey("equipes.id"), primary_key=True)
+    pontos = Column(Integer, nullable=False, default=0)
+
+    equipe = relationship("Equipe", back_populates="placar")
+
+
+class EventoPontuacao(Base):
+    """Append-only scoring log. The id is the global sequence number."""
+
+    __tablename__ = "eventos_pontuacao"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tipo = Column(String(20), nullable=False)  # "registrada", "corrigida" or "recalculada"
+    tentativa_id = Column(Integer, nullable=False)
+    equipe_id = Column(Integer, nullable=False)
+    questao_id = Column(Integer, nullable=False)
+    numero = Column(Integer, nullable=False)
+    acertou = Column(Boolean, nullable=False)  # attempt state after the event
+    pontos = Column(Integer, nullable=False)  # attempt points after the event
+    delta = Column(Integer, nullable=False)  # change to the team total
+    juiz_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class SnapshotPontuacao(Base):
+    """Folded scoring state up to ultimo_evento_id, so replay only reads the tail."""
+
+    __tablename__ = "snapshots_pontuacao"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ultimo_evento_id = Column(Integer, nullable=False)
+    estado = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,80 @@
+"""In-process change notifications for viewer pages.
+
+Writes publish on a channel; viewer sessions watch the channel sequence number from a
+lightweight fragment and only rerun the page when it moves (or when the heartbeat
+expires, as a fallback for writes that bypass the app).
+"""
+
+import os
+import threading
+import time
+from typing import Callable
+
+import streamlit as st
+
+# Seconds between full reruns even when nothing was published
+HEARTBEAT = float(os.environ.get("REFRESH_HEARTBEAT", "60"))
+# Seconds between cheap in-memory checks of the channel sequence
+INTERVALO = float(os.environ.get("REFRESH_INTERVALO", "4"))
+
+
+class Canal:
+    """Notification channel with a monotonically increasing sequence number."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def publicar(self) -> int:
+        """Announce a change. Returns the new sequence number."""
+        with self._lock:
+            self._seq += 1
+            return self._seq
+
+
+# Team totals or the ranking changed (attempt registered/corrected, team CRUD)
+placar_alterado = Canal()
+# Regatas or questions changed (activate/stop, add/edit/delete)
+questoes_alteradas = Canal()
+
+
+def atualizar_quando_mudar(
+    *canais: Canal,
+    heartbeat: float = HEARTBEAT,
+    intervalo: float = INTERVALO,
+    assinatura: Callable[[], str | None] | None = None,
+):
+    """Rerun the page when any channel publishes or the heartbeat expires.
+
+    Call it before reading the data the page shows, so a write that lands in between
+    still triggers a rerun. Replaces the ``time.sleep(...); st.rerun()`` loop: no script
+    thread is held while waiting, and idle viewers cost one integer comparison per tick.
+
+    `assinatura` returns a digest of what the page renders. When given, a publication or
+    heartbeat that leaves it unchanged does not rerun, so nothing is rebuilt or re-sent.
+    """
+    # Per-session state, kept in the fragment closure between its runs
+    estado = {
+        "vistos": tuple(c.seq for c in canais),
+        "assinatura": assinatura() if assinatura else None,
+        "inicio": time.monotonic(),
+    }
+
+    @st.fragment(run_every=intervalo)
+    def _observar():
+        atuais = tuple(c.seq for c in canais)
+        expirou = time.monotonic() - estado["inicio"] >= heartbeat
+        if atuais == estado["vistos"] and not expirou:
+            return
+        if assinatura is not None and assinatura() == estado["assinatura"]:
+            # Nothing visible changed; move the baseline instead of rerunning
+            estado["vistos"] = atuais
+            estado["inicio"] = time.monotonic()
+            return
+        st.rerun()
+
+    _observar()
@@ -0,0 +1,260 @@
+import streamlit as st
+from database import get_db
+from sessao import sessao_pagina
+from models import User, Equipe, Tentativa
+from auth import login_form, logout, require_auth
+from scoring import registrar_tentativa, registrar_tentativas_lote, corrigir_tentativa, motor
+from cache import REGATA_TTL, regata_cache
+from regras import regras_atuais
+
+st.set_page_config(page_title="Juiz - Batalha Olimpica", page_icon="⚖️", layout="wide", initial_sidebar_state="collapsed")
+
+if not login_form(get_db, User):
+    st.stop()
+
+user = require_auth(["juiz", "admin"])
+if not user:
+    st.error("Acesso restrito a juizes.")
+    st.stop()
+
+# --- HEADER ---
+st.markdown(
+    """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Bebas+Neue&family=Outfit:wght@300;400;600;700&display=swap');
+    .juiz-header { font-family:'Bebas Neue',sans-serif; font-size:2.2rem; letter-spacing:2px;
+                   background:linear-gradient(135deg,#f7971e,#ffd200); -webkit-background-clip:text;
+                   -webkit-text-fill-color:transparent; }
+    .juiz-user { font-family:'Outfit',sans-serif; color:#888; font-size:0.9rem; }
+    </style>
+    """,
+    unsafe_allow_html=True,
+)
+st.markdown(f'<div class="juiz-header">PAINEL DO JUIZ</div>', unsafe_allow_html=True)
+st.markdown(f'<div class="juiz-user">Logado como: {user["username"]}</div>', unsafe_allow_html=True)
+
+if st.sidebar.button("Sair", use_container_width=True):
+    logout()
+    st.rerun()
+
+# Lazily opened on first query and closed on every exit path (st.stop/st.rerun too)
+with sessao_pagina() as db:
+    # Active regata and its questions come from the shared snapshot, not the database
+    regata = regata_cache.get(max_age=REGATA_TTL).value
+
+    if not regata:
+        st.warning("Nenhuma regata ativa no momento. Aguarde o admin ativar uma regata.")
+        st.stop()
+
+    st.markdown(f"**Regata:** {regata.nome}")
+    st.divider()
+
+    equipes = db.query(Equipe).order_by(Equipe.nome).all()
+    questoes = regata.resumo
+
+    if not equipes:
+        st.warning("Nenhuma equipe cadastrada.")
+        st.stop()
+
+    if not questoes:
+        st.warning("Nenhuma questao nesta regata.")
+        st.stop()
+
+    # --- Selection ---
+    col_eq, col_qt = st.columns(2, gap="large")
+
+    with col_eq:
+        equipe_selecionada = st.selectbox(
+            "Equipe", equipes, format_func=lambda e: e.nome
+        )
+
+    niveis_display = {"facil": "🟢 Facil", "medio": "🟡 Medio", "dificil": "🔴 Dificil"}
+    with col_qt:
+        questao_selecionada = st.selectbox(
+            "Questao",
+            questoes,
+            format_func=lambda q: f"{niveis_display.get(q.nivel, q.nivel)} — {q.rotulo}",
+        )
+
+    modo_fila = st.toggle(
+        "Modo fila", help="Acumula as tentativas e envia todas de uma vez (util nos momentos de pico)."
+    )
+    fila = st.session_state.setdefault("fila", [])
+    regras = regras_atuais()
+
+    st.divider()
+
+    # --- Attempt status ---
+    # Served from the in-memory status matrix; refreshed only when a score was published
+    motor.atualizar(db)
+    num_tentativas, acertos, pontos_obtidos = motor.status(equipe_selecionada.id, questao_selecionada.id)
+    ja_acertou = acertos > 0
+
+
+    def _celula(tentativas: int, corretas: int, pontos: int) -> str:
+        if corretas:
+            return f"✅ {pontos}"
+        if tentativas:
+            return f"❌ {tentativas}/{regras.max_tentativas}"
+        return ""
+
+
+    with st.expander("Quadro geral da regata"):
+        colunas = [f"Q{q.id}" for q in questoes]
+        matriz = motor.matriz([e.id for e in equipes], [q.id for q in questoes])
+        st.dataframe(
+            [
+                {"Equipe": e.nome, **{c: _celula(*status) for c, status in zip(colunas, linha)}}
+                for e, linha in zip(equipes, matriz)
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    # Status indicator
+    if ja_acertou:
+        st.markdown(
+            f"""
+            <div style="background:linear-gradient(135deg,#1b5e20,#2e7d32); border-radius:12px; padding:1.5rem;
+                        text-align:center; margin-bottom:1rem;">
+                <div style="font-family:'Bebas Neue',sans-serif; font-size:1.8rem; color:#a5d6a7;
+                            letter-spacing:2px;">JA ACERTOU!</div>
+                <div style="font-family:'Outfit',sans-serif; color:#e8f5e9; font-size:1rem; margin-top:4px;">
+                    {num_tentativas} tentativa(s) — +{pontos_obtidos} pontos</div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    elif num_tentativas >= regras.max_tentativas:
+        st.markdown(
+            f"""
+            <div style="background:linear-gradient(135deg,#b71c1c,#c62828); border-radius:12px; padding:1.5rem;
+                        text-align:center; margin-bottom:1rem;">
+                <div style="font-family:'Bebas Neue',sans-serif; font-size:1.8rem; color:#ef9a9a;
+                            letter-spacing:2px;">TENTATIVAS ESGOTADAS</div>
+                <div style="font-family:'Outfit',sans-serif; color:#ffcdd2; font-size:1rem; margin-top:4px;">
+                    {num_tentativas}/{regras.max_tentativas} tentativas usadas — 0 pontos</div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    else:
+        proxima = num_tentativas + 1
+        pontos_possiveis = regras.pontos(proxima, questao_selecionada.nivel)
+
+        # Attempt dots
+        dots = ""
+        for i in range(1, regras.max_tentativas + 1):
+            if i <= num_tentativas:
+                dots += '<span style="color:#ef5350; font-size:1.5rem; margin:0 4px;">●</span>'
+            elif i == proxima:
+                dots += '<span style="color:#ffd200; font-size:1.5rem; margin:0 4px;">●</span>'
+            else:
+                dots += '<span style="color:#555; font-size:1.5rem; margin:0 4px;">○</span>'
+
+        st.markdown(
+            f"""
+            <div style="background:linear-gradient(135deg,#1a1a2e,#16213e); border:1px solid #333;
+                        border-radius:12px; padding:1.5rem; text-align:center; margin-bottom:1rem;">
+                <div style="margin-bottom:8px;">{dots}</div>
+                <div style="font-family:'Outfit',sans-serif; color:#ccc; font-size:1rem;">
+                    {proxima}a tentativa — vale <strong style="color:#ffd200;">{pontos_possiveis} pontos</strong></div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        # Action buttons
+        col1, col2 = st.columns(2, gap="large")
+
+        if modo_fila:
+            rotulo = (
+                f"{equipe_selecionada.nome} — {niveis_display.get(questao_selecionada.nivel, '')} "
+                f"{questao_selecionada.rotulo}"
+            )
+            with col1:
+                if st.button("✅ ACERTOU", use_container_width=True, type="primary"):
+                    fila.append((equipe_selecionada.id, questao_selecionada.id, True, rotulo))
+            with col2:
+                if st.button("❌ ERROU", use_container_width=True):
+                    fila.append((equipe_selecionada.id, questao_selecionada.id, False, rotulo))
+        else:
+            with col1:
+                if st.button("✅ ACERTOU", use_container_width=True, type="primary"):
+                    result = registrar_tentativa(
+                        db, equipe_selecionada.id, questao_selecionada.id, True, user["id"]
+                    )
+                    if "erro" in result:
+                        st.error(result["erro"])
+                    else:
+                        st.success(
+                            f"**{equipe_selecionada.nome}** — {niveis_display.get(questao_selecionada.nivel, '')} — "
+                            f"{result['numero']}a tentativa — **+{result['pontos']} pontos!**"
+                        )
+                        st.balloons()
+
+            with col2:
+                if st.button("❌ ERROU", use_container_width=True):
+                    result = registrar_tentativa(
+                        db, equipe_selecionada.id, questao_selecionada.id, False, user["id"]
+                    )
+                    if "erro" in result:
+                        st.error(result["erro"])
+                    else:
+                        restantes = regras.max_tentativas - result["numero"]
+                        st.warning(
+                            f"**{equipe_selecionada.nome}** — {niveis_display.get(questao_selecionada.nivel, '')} — "
+                            f"Errou tentativa {result['numero']}. Restam {restantes} tentativa(s)."
+                        )
+
+    # --- Queue ---
+    # Results of the last submitted queue, shown after the rerun that refreshed the status
+    for rotulo, result in st.session_state.pop("fila_resultados", []):
+        if "erro" in result:
+            st.error(f"**{rotulo}** — {result['erro']}")
+        elif result["acertou"]:
+            st.success(f"**{rotulo}** — {result['numero']}a tentativa — **+{result['pontos']} pontos!**")
+        else:
+            st.warning(f"**{rotulo}** — Errou tentativa {result['numero']}.")
+
+    if modo_fila and fila:
+        st.divider()
+        st.markdown(f"#### Fila ({len(fila)})")
+        for i, (_, _, acertou, rotulo) in enumerate(fila):
+            c1, c2 = st.columns([5, 1])
+            c1.markdown(f"{'✅' if acertou else '❌'} {rotulo}")
+            if c2.button("Remover", key=f"fila_remover_{i}"):
+                fila.pop(i)
+                st.rerun()
+
+        if st.button(f"Enviar fila ({len(fila)})", type="primary", use_container_width=True):
+            entradas = [(equipe_id, questao_id, acertou) for equipe_id, questao_id, acertou, _ in fila]
+            resultados = registrar_tentativas_lote(db, entradas, user["id"])
+            st.session_state["fila_resultados"] = [
+                (rotulo, result) for (_, _, _, rotulo), result in zip(fila, resultados)
+            ]
+            fila.clear()
+            st.rerun()
+
+    # --- Attempt history & correction ---
+    if num_tentativas:
+        tentativas_anteriores = (
+            db.query(Tentativa)
+            .filter_by(equipe_id=equipe_selecionada.id, questao_id=questao_selecionada.id)
+            .order_by(Tentativa.numero)
+            .all()
+        )
+        st.divider()
+        st.markdown("#### Historico de tentativas")
+        for t in tentativas_anteriores:
+            with st.container(border=True):
+                status_icon = "✅" if t.acertou else "❌"
+                c1, c2 = st.columns([5, 1])
+                c1.markdown(
+                    f"**Tentativa {t.numero}** — {status_icon} {'Acertou' if t.acertou else 'Errou'} — **{t.pontos} pts**"
+                )
+                can_correct = (t.juiz_id == user["id"]) or (user["role"] == "admin")
+                if can_correct:
+                    if c2.button("Corrigir", key=f"corrigir_{t.id}"):
+                        corrigir_tentativa(db, t.id, user["id"])
+                        st.rerun()
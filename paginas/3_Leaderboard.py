@@ -0,0 +1,79 @@
+import streamlit as st
+from cache import leaderboard_cache
+from notificacoes import HEARTBEAT, placar_alterado, atualizar_quando_mudar
+from placar import placar
+from render import placar_json
+
+st.set_page_config(page_title="Leaderboard - Batalha Olimpica", page_icon="🏆", layout="wide", initial_sidebar_state="collapsed")
+
+# --- GLOBAL CSS ---
+st.markdown(
+    """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Bebas+Neue&family=Outfit:wght@300;400;600;700&display=swap');
+    .stAppHeader { display: none; }
+    section[data-testid="stMain"] > div { padding-top: 1rem; }
+    </style>
+    """,
+    unsafe_allow_html=True,
+)
+
+# Rerun only when the rendered ranking changes, instead of sleeping in a loop. The
+# heartbeat reloads the snapshot (max_age) in case a write bypassed the app.
+atualizar_quando_mudar(
+    placar_alterado,
+    assinatura=lambda: leaderboard_cache.get(max_age=HEARTBEAT).digest,
+)
+
+# Shared across all viewers; only recomputed after a scoring write, team CRUD or a
+# regata/question change. Every view below comes from this one snapshot.
+snapshot = leaderboard_cache.get(max_age=HEARTBEAT)
+leaderboards = snapshot.value
+
+niveis_display = {"facil": "🟢 Facil", "medio": "🟡 Medio", "dificil": "🔴 Dificil"}
+visoes = {"geral": ("Ranking Geral", leaderboards["geral"])}
+regata_ativa = leaderboards["regata_ativa"]
+if regata_ativa is not None:
+    ativa = leaderboards["por_regata"][regata_ativa]
+    visoes["ativa"] = (f"Regata ativa — {ativa['nome']}", ativa["ranking"])
+for regata_id, regata in leaderboards["por_regata"].items():
+    visoes[f"regata-{regata_id}"] = (regata["nome"], regata["ranking"])
+for nivel, ranking_nivel in leaderboards["por_nivel"].items():
+    visoes[f"nivel-{nivel}"] = (niveis_display.get(nivel, nivel), ranking_nivel)
+
+# ?visao=... lets a venue screen open directly on a view
+padrao = st.query_params.get("visao", "geral")
+visao = st.radio(
+    "Visao",
+    list(visoes),
+    index=list(visoes).index(padrao) if padrao in visoes else 0,
+    format_func=lambda v: visoes[v][0],
+    horizontal=True,
+    label_visibility="collapsed",
+    key="visao",
+)
+titulo, ranking = visoes[visao]
+
+# --- HEADER ---
+st.markdown(
+    f"""
+    <div style="text-align:center; padding:1rem 0 2rem;">
+        <div style="font-family:'Bebas Neue',sans-serif; font-size:3.5rem; letter-spacing:4px; line-height:1;
+                    background:linear-gradient(135deg,#f7971e,#ffd200); -webkit-background-clip:text;
+                    -webkit-text-fill-color:transparent;">BATALHA OLIMPICA</div>
+        <div style="font-family:'Outfit',sans-serif; color:#666; font-size:0.9rem; letter-spacing:3px;
+                    text-transform:uppercase; margin-top:4px;">{titulo}</div>
+    </div>
+    """,
+    unsafe_allow_html=True,
+)
+
+if not ranking:
+    st.markdown(
+        '<div style="text-align:center; color:#666; font-family:Outfit,sans-serif; padding:4rem;">Nenhuma equipe cadastrada.</div>',
+        unsafe_allow_html=True,
+    )
+else:
+    # Serialized once per ranking digest and view for all viewers; the component's
+    # static bundle draws and animates the bars in the browser
+    placar(placar_json(ranking, f"{snapshot.digest}:{visao}"))
@@ -1,7 +1,7 @@
-import time
 import streamlit as st
-from database import get_db
-from models import Regata, Questao
+from cache import REGATA_TTL, regata_cache
+from notificacoes import questoes_alteradas, atualizar_quando_mudar
+from render import cartao_questao
 
 st.set_page_config(page_title="Questoes - Batalha Olimpica", page_icon="📝", layout="wide", initial_sidebar_state="collapsed")
 
@@ -14,9 +14,15 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-db = get_db()
+# Rerun only when the admin changes regatas/questions (or on heartbeat), and only if
+# the content actually differs, so unchanged questions are not re-sent to viewers
+atualizar_quando_mudar(
+    questoes_alteradas,
+    assinatura=lambda: regata_cache.get(max_age=REGATA_TTL).digest,
+)
 
-regata = db.query(Regata).filter_by(ativa=True).first()
+# Shared snapshot of the active regata; no queries per viewer in steady state
+regata = regata_cache.get(max_age=REGATA_TTL).value
 
 if not regata:
     st.markdown(
@@ -31,9 +37,7 @@ if not regata:
         """,
         unsafe_allow_html=True,
     )
-    db.close()
-    time.sleep(5)
-    st.rerun()
+    st.stop()
 
 # Header
 st.markdown(
@@ -49,16 +53,15 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-questoes = db.query(Questao).filter_by(regata_id=regata.id).all()
+questoes = regata.questoes
 
 if not questoes:
     st.info("Nenhuma questao cadastrada para esta regata.")
 else:
     for q in questoes:
         st.divider()
-        if q.enunciado:
-            st.markdown(q.enunciado)
-        if q.imagem:
-            st.image(q.imagem, use_container_width=True)
-
-db.close()
+        enunciado, imagem = cartao_questao(q.enunciado, q.imagem_hash, q.imagem_mime)
+        if enunciado:
+            st.markdown(enunciado)
+        if imagem:
+            st.markdown(imagem, unsafe_allow_html=True)
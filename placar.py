@@ -0,0 +1,20 @@
+"""Leaderboard bars as a static client-side component.
+
+The bundle in frontend/placar/ is loaded once per client. Each refresh only sends the
+compact ranking JSON from ``render.placar_json``; the browser draws the rows and
+animates bar widths and reordering in place.
+"""
+
+import os
+
+import streamlit.components.v1 as components
+
+_FRONTEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "placar")
+
+_componente = components.declare_component("placar", path=_FRONTEND)
+
+
+def placar(dados: str, key: str = "placar") -> None:
+    """Render the bars for `dados` (a placar_json string). A stable key keeps the same
+    iframe mounted across refreshes and view changes, so only the JSON is re-sent."""
+    _componente(dados=dados, key=key, default=None)
@@ -0,0 +1,94 @@
+"""Configurable scoring rules.
+
+Rules are read from a JSON file (``REGRAS_PONTUACAO`` env var, default
+``regras_pontuacao.json`` next to this module); without it the classic 100/80/50 table
+applies. Example::
+
+    {
+        "max_tentativas": 3,
+        "pontos_por_tentativa": {"1": 100, "2": 80, "3": 50},
+        "multiplicador_por_nivel": {"facil": 1, "medio": 1.5, "dificil": 2}
+    }
+
+``max_tentativas`` (default 3) is how many attempts a team gets per question; an
+attempt with no entry in ``pontos_por_tentativa`` is worth 0 points.
+
+Changing the file affects new attempts immediately; existing ``tentativas.pontos`` are
+rewritten with ``python manage.py pontos recalcular``.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+
+from sqlalchemy import and_, case
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REGRAS_PATH = os.environ.get("REGRAS_PONTUACAO", os.path.join(BASE_DIR, "regras_pontuacao.json"))
+
+PONTOS_POR_TENTATIVA = {1: 100, 2: 80, 3: 50}
+MAX_TENTATIVAS = 3
+
+
+@dataclass(frozen=True)
+class RegrasPontuacao:
+    pontos_por_tentativa: dict[int, int] = field(default_factory=lambda: dict(PONTOS_POR_TENTATIVA))
+    multiplicador_por_nivel: dict[str, float] = field(default_factory=dict)
+    max_tentativas: int = MAX_TENTATIVAS
+
+    def pontos(self, numero: int, nivel: str | None, acertou: bool = True) -> int:
+        if not acertou:
+            return 0
+        base = self.pontos_por_tentativa.get(numero, 0)
+        return round(base * self.multiplicador_por_nivel.get(nivel, 1))
+
+    def expressao_pontos(self, numero, nivel):
+        """SQL CASE giving the points of a correct attempt, for set-based inserts/updates.
+
+        Enumerates every (numero, nivel) pair with the value computed by pontos(), so SQL
+        and Python always agree on rounding.
+        """
+        casos = []
+        for n in self.pontos_por_tentativa:
+            for nv in self.multiplicador_por_nivel:
+                casos.append((and_(numero == n, nivel == nv), self.pontos(n, nv)))
+            casos.append((numero == n, self.pontos(n, None)))
+        return case(*casos, else_=0)
+
+    @classmethod
+    def from_dict(cls, dados: dict) -> "RegrasPontuacao":
+        pontos = dados.get("pontos_por_tentativa") or PONTOS_POR_TENTATIVA
+        max_tentativas = dados.get("max_tentativas", MAX_TENTATIVAS)
+        if isinstance(max_tentativas, bool) or not isinstance(max_tentativas, int) or max_tentativas < 1:
+            raise ValueError(f"max_tentativas deve ser um inteiro positivo, recebido {max_tentativas!r}")
+        return cls(
+            pontos_por_tentativa={int(k): int(v) for k, v in pontos.items()},
+            multiplicador_por_nivel={k: float(v) for k, v in dados.get("multiplicador_por_nivel", {}).items()},
+            max_tentativas=max_tentativas,
+        )
+
+
+def carregar_regras(caminho: str = REGRAS_PATH) -> RegrasPontuacao:
+    if not os.path.exists(caminho):
+        return RegrasPontuacao()
+    with open(caminho) as f:
+        return RegrasPontuacao.from_dict(json.load(f))
+
+
+_lock = threading.Lock()
+_cache: tuple[float | None, RegrasPontuacao] = (None, RegrasPontuacao())
+
+
+def regras_atuais() -> RegrasPontuacao:
+    """Rules from REGRAS_PATH, reloaded only when the file's mtime changes."""
+    global _cache
+    try:
+        mtime = os.stat(REGRAS_PATH).st_mtime
+    except FileNotFoundError:
+        mtime = None
+    if mtime != _cache[0]:
+        with _lock:
+            if mtime != _cache[0]:
+                _cache = (mtime, carregar_regras(REGRAS_PATH))
+    return _cache[1]
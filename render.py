@@ -0,0 +1,37 @@
+"""Page payloads shared by every session, cached so unchanged output is not rebuilt."""
+
+import json
+
+from imagens import url_imagem
+
+_placares: dict[str, str] = {}
+_PLACARES_MAX = 64
+
+
+def placar_json(ranking, digest: str | None) -> str:
+    """Compact leaderboard payload, ``[[equipe, pontos, posicao], ...]``, for the client-side
+    placar component. Serialized once per digest (ranking + view), shared by all sessions."""
+    if digest is not None and digest in _placares:
+        return _placares[digest]
+    dados = json.dumps(
+        [[item["equipe"], item["pontos"], item["posicao"]] for item in ranking],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    if digest is not None:
+        if len(_placares) >= _PLACARES_MAX:
+            _placares.clear()
+        _placares[digest] = dados
+    return dados
+
+
+def cartao_questao(enunciado: str, imagem_hash: str | None, imagem_mime: str | None) -> tuple[str, str | None]:
+    """Question card parts: (statement Markdown, image HTML or None).
+
+    The statement stays plain Markdown (no raw HTML, so "x < y" is safe) and its math
+    is typeset by Streamlit's bundled KaTeX in the browser.
+    """
+    imagem = None
+    if imagem_hash:
+        imagem = f'<img src="{url_imagem(imagem_hash, imagem_mime)}" style="width:100%;">'
+    return (enunciado or "").strip(), imagem
@@ -1,64 +1,629 @@
+import bisect
+import json
+import math
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from models import Tentativa, Equipe, Questao
+from sqlalchemy import DateTime, case, exists, func, insert, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from models import Tentativa, Equipe, Regata, Questao, Placar, EventoPontuacao, SnapshotPontuacao
+from cache import leaderboard_cache
+from notificacoes import placar_alterado
+from regras import RegrasPontuacao, regras_atuais
 
-PONTOS_POR_TENTATIVA = {1: 100, 2: 80, 3: 50}
+# Times a write transaction is retried after losing a numbering race (IntegrityError)
+MAX_TENTATIVAS_DB = 3
+# Events folded between persisted snapshots of the scoring state
+SNAPSHOT_INTERVALO = int(os.environ.get("SNAPSHOT_INTERVALO", "500"))
 
 
-def registrar_tentativa(
-    db: Session, equipe_id: int, questao_id: int, acertou: bool, juiz_id: int
-) -> dict:
-    """Register an attempt and calculate points automatically."""
-    # Check previous attempts
-    tentativas_anteriores = (
-        db.query(Tentativa)
-        .filter_by(equipe_id=equipe_id, questao_id=questao_id)
-        .order_by(Tentativa.numero)
-        .all()
+def _somar_placar(db: Session, equipe_id: int, delta: int) -> None:
+    """Add delta to the team's materialized total (upsert), inside the caller's transaction."""
+    stmt = sqlite_insert(Placar).values(equipe_id=equipe_id, pontos=delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Placar.equipe_id],
+        set_={"pontos": Placar.pontos + delta},
     )
+    db.execute(stmt)
 
-    # Check if already correct
-    for t in tentativas_anteriores:
-        if t.acertou:
-            return {"erro": "Equipe ja acertou esta questao."}
 
-    # Check if max attempts reached
-    if len(tentativas_anteriores) >= 3:
-        return {"erro": "Equipe ja esgotou as 3 tentativas nesta questao."}
+def _registrar_evento(
+    db: Session,
+    tipo: str,
+    tentativa_id: int,
+    equipe_id: int,
+    questao_id: int,
+    numero: int,
+    acertou: bool,
+    pontos: int,
+    delta: int,
+    juiz_id: int | None,
+) -> None:
+    """Append to the scoring event log, inside the caller's transaction."""
+    db.execute(
+        insert(EventoPontuacao).values(
+            tipo=tipo,
+            tentativa_id=tentativa_id,
+            equipe_id=equipe_id,
+            questao_id=questao_id,
+            numero=numero,
+            acertou=acertou,
+            pontos=pontos,
+            delta=delta,
+            juiz_id=juiz_id,
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+
 
-    numero = len(tentativas_anteriores) + 1
+def _inserir_tentativa(
+    db: Session, equipe_id: int, questao_id: int, acertou: bool, juiz_id: int,
+    regras: RegrasPontuacao | None = None,
+) -> dict:
+    """Validate, number and insert an attempt in a single INSERT ... SELECT.
 
+    The statement takes SQLite's write lock before reading the previous attempts, so two
+    judges scoring the same team/question are serialized instead of both writing attempt
+    #1; the unique (equipe_id, questao_id, numero) index backs this up. Does not commit.
+    """
+    anteriores = (
+        select(
+            func.count().label("n"),
+            func.coalesce(func.max(Tentativa.acertou), False).label("acertou"),
+        )
+        .where(Tentativa.equipe_id == equipe_id, Tentativa.questao_id == questao_id)
+        .subquery()
+    )
+    regras = regras or regras_atuais()
+    numero = anteriores.c.n + 1
     if acertou:
-        pontos = PONTOS_POR_TENTATIVA.get(numero, 0)
+        nivel = select(Questao.nivel).where(Questao.id == questao_id).scalar_subquery()
+        pontos = regras.expressao_pontos(numero, nivel)
     else:
-        pontos = 0
-
-    tentativa = Tentativa(
-        equipe_id=equipe_id,
-        questao_id=questao_id,
-        numero=numero,
-        acertou=acertou,
-        pontos=pontos,
-        juiz_id=juiz_id,
+        pontos = literal(0)
+
+    stmt = (
+        insert(Tentativa)
+        .from_select(
+            ["equipe_id", "questao_id", "numero", "acertou", "pontos", "juiz_id", "created_at"],
+            select(
+                literal(equipe_id),
+                literal(questao_id),
+                numero,
+                literal(acertou),
+                pontos,
+                literal(juiz_id),
+                literal(datetime.now(timezone.utc), DateTime),
+            ).where(anteriores.c.n < regras.max_tentativas, anteriores.c.acertou == False),  # noqa: E712
+        )
+        .returning(Tentativa.id, Tentativa.numero, Tentativa.pontos)
     )
-    db.add(tentativa)
-    db.commit()
+    row = db.execute(stmt).first()
 
+    if row is None:
+        # Rejected: one extra read only on this path, to report why
+        ja_acertou = db.query(
+            exists().where(
+                Tentativa.equipe_id == equipe_id,
+                Tentativa.questao_id == questao_id,
+                Tentativa.acertou == True,  # noqa: E712
+            )
+        ).scalar()
+        if ja_acertou:
+            return {"erro": "Equipe ja acertou esta questao."}
+        return {"erro": f"Equipe ja esgotou as {regras.max_tentativas} tentativas nesta questao."}
+
+    _somar_placar(db, equipe_id, row.pontos)
+    _registrar_evento(
+        db, "registrada", row.id, equipe_id, questao_id, row.numero, acertou, row.pontos, row.pontos, juiz_id
+    )
     return {
-        "numero": numero,
+        "numero": row.numero,
         "acertou": acertou,
-        "pontos": pontos,
+        "pontos": row.pontos,
+    }
+
+
+def registrar_tentativa(
+    db: Session, equipe_id: int, questao_id: int, acertou: bool, juiz_id: int
+) -> dict:
+    """Register an attempt and calculate points automatically, atomically."""
+    for retentativa in range(MAX_TENTATIVAS_DB):
+        try:
+            result = _inserir_tentativa(db, equipe_id, questao_id, acertou, juiz_id)
+            db.commit()
+            break
+        except IntegrityError:
+            # Lost a numbering race on a connection without the write lock; renumber
+            db.rollback()
+            if retentativa == MAX_TENTATIVAS_DB - 1:
+                raise
+
+    if "erro" not in result:
+        leaderboard_cache.invalidate()
+    return result
+
+
+def registrar_tentativas_lote(
+    db: Session, entradas: list[tuple[int, int, bool]], juiz_id: int
+) -> list[dict]:
+    """Register many (equipe_id, questao_id, acertou) attempts in one transaction.
+
+    Entries are validated and numbered in order, so two entries for the same team and
+    question become attempts #n and #n+1. Returns one result per entry, as
+    registrar_tentativa() would; rejected entries carry "erro" and do not abort the rest.
+    """
+    regras = regras_atuais()
+    for retentativa in range(MAX_TENTATIVAS_DB):
+        try:
+            resultados = [
+                _inserir_tentativa(db, equipe_id, questao_id, acertou, juiz_id, regras)
+                for equipe_id, questao_id, acertou in entradas
+            ]
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if retentativa == MAX_TENTATIVAS_DB - 1:
+                raise
+
+    if any("erro" not in r for r in resultados):
+        leaderboard_cache.invalidate()
+    return resultados
+
+
+def corrigir_tentativa(db: Session, tentativa_id: int, juiz_id: int | None = None) -> dict:
+    """Flip the result of an attempt, recalculating its points and the team total.
+
+    The row is updated in place as the current projection; the change itself is kept in
+    the event log.
+    """
+    # Take SQLite's write lock before reading the row, so two judges correcting the same
+    # attempt are serialized: the second one reads the first one's flip, and placar and
+    # the event log get one consistent delta each
+    bloqueio = db.execute(
+        update(Tentativa).where(Tentativa.id == tentativa_id).values(numero=Tentativa.numero)
+    )
+    if bloqueio.rowcount == 0:
+        db.rollback()
+        return {"erro": "Tentativa nao encontrada."}
+    tentativa = db.execute(
+        select(Tentativa).where(Tentativa.id == tentativa_id).execution_options(populate_existing=True)
+    ).scalar_one()
+
+    pontos_antes = tentativa.pontos
+    tentativa.acertou = not tentativa.acertou
+    nivel = db.query(Questao.nivel).filter(Questao.id == tentativa.questao_id).scalar()
+    tentativa.pontos = regras_atuais().pontos(tentativa.numero, nivel, tentativa.acertou)
+    delta = tentativa.pontos - pontos_antes
+    _somar_placar(db, tentativa.equipe_id, delta)
+    _registrar_evento(
+        db, "corrigida", tentativa.id, tentativa.equipe_id, tentativa.questao_id,
+        tentativa.numero, tentativa.acertou, tentativa.pontos, delta, juiz_id,
+    )
+    db.commit()
+    leaderboard_cache.invalidate()
+
+    return {
+        "numero": tentativa.numero,
+        "acertou": tentativa.acertou,
+        "pontos": tentativa.pontos,
+    }
+
+
+# "competicao" (1, 2, 2, 4) or "densa" (1, 2, 2, 3) positions for tied teams
+MODO_RANKING = os.environ.get("RANKING_MODO", "competicao")
+
+
+class Classificacao:
+    """Teams ordered by points, then by who reached their score first, then by name.
+
+    Kept as a sorted list of keys plus the sorted distinct scores. An update finds its
+    slots by binary search but inserting into or deleting from a list shifts the tail,
+    so it is O(n) (a memmove, cheap for tournament-sized n); a position lookup is one
+    O(log n) binary search and the full ranking is a single walk.
+    The tiebreak makes the order deterministic, so tied teams never swap places between
+    refreshes. Teams with no points are ordered by name.
+    """
+
+    def __init__(self):
+        self._chaves: list[tuple] = []  # (-pontos, alcancado_em, nome, equipe_id), sorted
+        self._por_equipe: dict[int, tuple] = {}
+        self._valores: list[int] = []  # distinct -pontos, sorted
+        self._contagem: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+    def definir(self, equipe_id: int, nome: str, pontos: int, alcancado_em: float | None = None) -> None:
+        """Insert or update a team. `alcancado_em` (timestamp or sequence, lower ranks
+        first) is when the team reached this score; None keeps the previous one."""
+        anterior = self._por_equipe.get(equipe_id)
+        if alcancado_em is None:
+            alcancado_em = anterior[1] if anterior else math.inf
+        chave = (-pontos, alcancado_em if pontos else math.inf, nome, equipe_id)
+        if chave == anterior:
+            return
+        if anterior is not None:
+            self.remover(equipe_id)
+        bisect.insort(self._chaves, chave)
+        self._por_equipe[equipe_id] = chave
+        if self._contagem.get(chave[0], 0) == 0:
+            bisect.insort(self._valores, chave[0])
+        self._contagem[chave[0]] = self._contagem.get(chave[0], 0) + 1
+
+    def remover(self, equipe_id: int) -> None:
+        chave = self._por_equipe.pop(equipe_id)
+        del self._chaves[bisect.bisect_left(self._chaves, chave)]
+        self._contagem[chave[0]] -= 1
+        if self._contagem[chave[0]] == 0:
+            del self._contagem[chave[0]]
+            del self._valores[bisect.bisect_left(self._valores, chave[0])]
+
+    def posicao(self, equipe_id: int, modo: str = MODO_RANKING) -> int:
+        negativo = self._por_equipe[equipe_id][0]
+        if modo == "densa":
+            return bisect.bisect_left(self._valores, negativo) + 1
+        # Teams with strictly more points sort before (negativo,)
+        return bisect.bisect_left(self._chaves, (negativo,)) + 1
+
+    def ranking(self, modo: str = MODO_RANKING) -> list[dict]:
+        ranking = []
+        posicao = 0
+        anterior = None
+        for i, (negativo, _, nome, _) in enumerate(self._chaves):
+            if negativo != anterior:
+                posicao = posicao + 1 if modo == "densa" else i + 1
+                anterior = negativo
+            ranking.append({"posicao": posicao, "equipe": nome, "pontos": -negativo})
+        return ranking
+
+    @classmethod
+    def de(cls, equipes, pontos: dict[int, int], alcancado: dict[int, float]) -> "Classificacao":
+        classificacao = cls()
+        for equipe_id, nome in equipes:
+            classificacao.definir(equipe_id, nome, pontos.get(equipe_id, 0), alcancado.get(equipe_id))
+        return classificacao
+
+
+def _timestamp(momento: datetime | None) -> float | None:
+    return momento.timestamp() if momento is not None else None
+
+
+def classificacao_geral(db: Session) -> Classificacao:
+    """Global standings: totals from the materialized placar, tiebreak by each team's
+    last scoring attempt."""
+    equipes = db.query(Equipe.id, Equipe.nome).all()
+    pontos = dict(db.query(Placar.equipe_id, Placar.pontos).all())
+    alcancado = {
+        equipe_id: _timestamp(momento)
+        for equipe_id, momento in db.query(Tentativa.equipe_id, func.max(Tentativa.created_at))
+        .filter(Tentativa.pontos > 0)
+        .group_by(Tentativa.equipe_id)
     }
+    return Classificacao.de(equipes, pontos, alcancado)
 
 
 def calcular_leaderboard(db: Session) -> list[dict]:
-    """Calculate global leaderboard across all regatas, sorted by total points descending."""
-    results = (
-        db.query(Equipe.nome, func.coalesce(func.sum(Tentativa.pontos), 0).label("pontos"))
-        .outerjoin(Tentativa, Tentativa.equipe_id == Equipe.id)
-        .group_by(Equipe.id)
-        .order_by(func.sum(Tentativa.pontos).desc())
+    """Global leaderboard across all regatas, read from the materialized placar (O(teams))."""
+    return classificacao_geral(db).ranking()
+
+
+NIVEIS = ("facil", "medio", "dificil")
+
+
+def calcular_leaderboards(db: Session) -> dict:
+    """Global, per-regata, per-level and active-regata standings from one scan of tentativas.
+
+    Four queries: a single GROUP BY over the scoring attempts (joined to questoes) yields
+    points and the last scoring time per (team, regata, level), and three small lookups
+    read team names, regatas and the materialized placar, which supplies the global
+    totals. Every breakdown is folded from those rows in Python, so switching views
+    costs no queries. The lookups are not merged into the scan: they are O(teams) or
+    O(regatas), and joining them in would repeat names in every grouped row.
+    """
+    equipes = db.query(Equipe.id, Equipe.nome).all()
+    regatas = db.query(Regata.id, Regata.nome, Regata.ativa).order_by(Regata.id).all()
+    placar = dict(db.query(Placar.equipe_id, Placar.pontos).all())
+    linhas = (
+        db.query(
+            Tentativa.equipe_id,
+            Questao.regata_id,
+            Questao.nivel,
+            func.sum(Tentativa.pontos),
+            func.max(Tentativa.created_at),
+        )
+        .join(Questao, Questao.id == Tentativa.questao_id)
+        .filter(Tentativa.pontos > 0)
+        .group_by(Tentativa.equipe_id, Questao.regata_id, Questao.nivel)
         .all()
     )
 
-    return [{"equipe": nome, "pontos": pontos} for nome, pontos in results]
+    def _somar(destino: dict, equipe_id: int, pontos: int, momento: float) -> None:
+        totais, alcancado = destino
+        totais[equipe_id] = totais.get(equipe_id, 0) + pontos
+        alcancado[equipe_id] = max(alcancado.get(equipe_id, momento), momento)
+
+    geral: tuple[dict, dict] = ({}, {})
+    por_regata: dict[int, tuple[dict, dict]] = {r.id: ({}, {}) for r in regatas}
+    por_nivel: dict[str, tuple[dict, dict]] = {n: ({}, {}) for n in NIVEIS}
+    for equipe_id, regata_id, nivel, pontos, momento in linhas:
+        momento = _timestamp(momento)
+        _somar(geral, equipe_id, pontos, momento)
+        _somar(por_regata.setdefault(regata_id, ({}, {})), equipe_id, pontos, momento)
+        _somar(por_nivel.setdefault(nivel, ({}, {})), equipe_id, pontos, momento)
+
+    regata_ativa = next((r for r in regatas if r.ativa), None)
+    return {
+        "geral": Classificacao.de(equipes, placar, geral[1]).ranking(),
+        "por_regata": {
+            r.id: {"nome": r.nome, "ranking": Classificacao.de(equipes, *por_regata[r.id]).ranking()}
+            for r in regatas
+        },
+        "por_nivel": {nivel: Classificacao.de(equipes, *dados).ranking() for nivel, dados in por_nivel.items()},
+        "regata_ativa": regata_ativa.id if regata_ativa else None,
+    }
+
+
+def verificar_placar(db: Session) -> list[dict]:
+    """Recompute totals from tentativas and return every team whose placar drifted."""
+    esperado = dict(
+        db.query(Tentativa.equipe_id, func.sum(Tentativa.pontos))
+        .join(Equipe, Equipe.id == Tentativa.equipe_id)
+        .group_by(Tentativa.equipe_id)
+        .all()
+    )
+    atual = dict(db.query(Placar.equipe_id, Placar.pontos).all())
+
+    divergencias = []
+    for equipe_id in sorted(set(esperado) | set(atual)):
+        esperado_pts = esperado.get(equipe_id, 0)
+        atual_pts = atual.get(equipe_id, 0)
+        if esperado_pts != atual_pts:
+            divergencias.append(
+                {"equipe_id": equipe_id, "placar": atual_pts, "tentativas": esperado_pts}
+            )
+    return divergencias
+
+
+def _reconstruir_placar(db: Session) -> None:
+    """Replace placar with the totals summed from tentativas, inside the caller's transaction."""
+    totais = (
+        select(Tentativa.equipe_id, func.sum(Tentativa.pontos))
+        .join(Equipe, Equipe.id == Tentativa.equipe_id)
+        .group_by(Tentativa.equipe_id)
+    )
+    db.query(Placar).delete()
+    db.execute(insert(Placar).from_select(["equipe_id", "pontos"], totais))
+
+
+def reconstruir_placar(db: Session) -> list[dict]:
+    """Rebuild placar from tentativas. Returns the drift found before rebuilding."""
+    divergencias = verificar_placar(db)
+    _reconstruir_placar(db)
+    db.commit()
+    leaderboard_cache.invalidate()
+
+    return divergencias
+
+
+def semear_eventos(db: Session) -> int:
+    """Seed the event log from existing tentativas (databases created before the log)."""
+    colunas = ["tipo", "tentativa_id", "equipe_id", "questao_id", "numero", "acertou", "pontos", "delta", "juiz_id", "created_at"]
+    origem = select(
+        literal("registrada"),
+        Tentativa.id,
+        Tentativa.equipe_id,
+        Tentativa.questao_id,
+        Tentativa.numero,
+        Tentativa.acertou,
+        Tentativa.pontos,
+        Tentativa.pontos,
+        Tentativa.juiz_id,
+        Tentativa.created_at,
+    ).order_by(Tentativa.id)
+    result = db.execute(insert(EventoPontuacao).from_select(colunas, origem))
+    db.commit()
+    return result.rowcount
+
+
+def recalcular_pontos(db: Session, regras: RegrasPontuacao | None = None, simular: bool = False) -> dict:
+    """Rewrite every tentativas.pontos under `regras` (default: the current rules).
+
+    Set-based: one INSERT ... SELECT logs a "recalculada" event per changed attempt, one
+    UPDATE with a CASE over (numero, nivel) rewrites the points, and placar is rebuilt
+    from a GROUP BY, so the whole pass is a handful of statements regardless of the table
+    size. With `simular`, everything is rolled back and only the report is returned.
+
+    Returns {"antes", "depois", "alteradas"}: per-team totals before and after and the
+    number of attempts whose points changed.
+    """
+    regras = regras or regras_atuais()
+    nivel = select(Questao.nivel).where(Questao.id == Tentativa.questao_id).scalar_subquery()
+    novos = case((Tentativa.acertou == True, regras.expressao_pontos(Tentativa.numero, nivel)), else_=0)  # noqa: E712
+
+    totais = select(Tentativa.equipe_id, func.sum(Tentativa.pontos)).group_by(Tentativa.equipe_id)
+    antes = dict(db.execute(totais).all())
+
+    colunas = ["tipo", "tentativa_id", "equipe_id", "questao_id", "numero", "acertou", "pontos", "delta", "juiz_id", "created_at"]
+    alterados = select(
+        literal("recalculada"),
+        Tentativa.id,
+        Tentativa.equipe_id,
+        Tentativa.questao_id,
+        Tentativa.numero,
+        Tentativa.acertou,
+        novos,
+        novos - Tentativa.pontos,
+        literal(None),
+        literal(datetime.now(timezone.utc), DateTime),
+    ).where(novos != Tentativa.pontos).order_by(Tentativa.id)
+    db.execute(insert(EventoPontuacao).from_select(colunas, alterados))
+
+    alteradas = db.execute(
+        update(Tentativa).where(novos != Tentativa.pontos).values(pontos=novos),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    _reconstruir_placar(db)
+    depois = dict(db.execute(totais).all())
+
+    if simular:
+        db.rollback()
+    else:
+        db.commit()
+        if alteradas:
+            leaderboard_cache.invalidate()
+    return {"antes": antes, "depois": depois, "alteradas": alteradas}
+
+
+class EstadoPontuacao:
+    """Scoring state folded from the event log."""
+
+    def __init__(self):
+        self.ultimo_evento = 0
+        self.totais: dict[int, int] = {}
+        # (equipe_id, questao_id) -> [tentativas usadas, tentativas corretas, pontos]
+        self.questoes: dict[tuple[int, int], list[int]] = {}
+
+    def aplicar(self, evento) -> None:
+        chave = (evento.equipe_id, evento.questao_id)
+        questao = self.questoes.setdefault(chave, [0, 0, 0])
+        if evento.tipo == "registrada":
+            questao[0] = max(questao[0], evento.numero)
+            questao[1] += 1 if evento.acertou else 0
+        elif evento.tipo == "corrigida":
+            questao[1] += 1 if evento.acertou else -1
+        # "recalculada" only moves points
+        questao[2] += evento.delta
+        self.totais[evento.equipe_id] = self.totais.get(evento.equipe_id, 0) + evento.delta
+        self.ultimo_evento = evento.id
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "ultimo_evento": self.ultimo_evento,
+            "totais": self.totais,
+            "questoes": [[e, q, *v] for (e, q), v in self.questoes.items()],
+        })
+
+    @classmethod
+    def from_json(cls, dados: str) -> "EstadoPontuacao":
+        raw = json.loads(dados)
+        estado = cls()
+        estado.ultimo_evento = raw["ultimo_evento"]
+        estado.totais = {int(k): v for k, v in raw["totais"].items()}
+        estado.questoes = {(e, q): [n, c, p] for e, q, n, c, p in raw["questoes"]}
+        return estado
+
+
+class MotorPontuacao:
+    """Folds the scoring event log into per-team and per-question state.
+
+    Startup loads the latest snapshot and replays only the events after it; afterwards
+    each sincronizar() reads just the new tail, so totals are O(1) lookups. Only the
+    process that writes scores should save snapshots (`salvar_snapshots`); readers such
+    as the API stream just load them.
+    """
+
+    def __init__(self, snapshot_intervalo: int = SNAPSHOT_INTERVALO, salvar_snapshots: bool = True):
+        self.snapshot_intervalo = snapshot_intervalo
+        self.salvar_snapshots = salvar_snapshots
+        self.estado: EstadoPontuacao | None = None
+        self._ultimo_snapshot = 0
+        self._seq_visto: int | None = None
+        self._lock = threading.Lock()
+
+    def sincronizar(self, db: Session, ao_aplicar: Callable | None = None) -> int:
+        """Apply events committed since the last call. Returns how many were applied.
+
+        `ao_aplicar(evento, estado)` is called after each event is folded in, for
+        consumers that need the state as of every event (e.g. the delta stream).
+        """
+        with self._lock:
+            if self.estado is None:
+                self._carregar_snapshot(db)
+
+            novos = (
+                db.query(EventoPontuacao)
+                .filter(EventoPontuacao.id > self.estado.ultimo_evento)
+                .order_by(EventoPontuacao.id)
+                .all()
+            )
+            for evento in novos:
+                self.estado.aplicar(evento)
+                if ao_aplicar is not None:
+                    ao_aplicar(evento, self.estado)
+
+            if self.salvar_snapshots and self.estado.ultimo_evento - self._ultimo_snapshot >= self.snapshot_intervalo:
+                self._salvar_snapshot(db)
+            return len(novos)
+
+    def atualizar(self, db: Session) -> None:
+        """sincronizar() only if a score was published since the last call.
+
+        Judge reruns that change nothing (switching team or question) cost one integer
+        comparison instead of a query.
+        """
+        seq = placar_alterado.seq
+        if seq != self._seq_visto or self.estado is None:
+            self.sincronizar(db)
+            self._seq_visto = seq
+
+    def total(self, equipe_id: int) -> int:
+        return self.estado.totais.get(equipe_id, 0) if self.estado else 0
+
+    def status(self, equipe_id: int, questao_id: int) -> tuple[int, int, int]:
+        """(tentativas usadas, tentativas corretas, pontos) of a team on a question."""
+        if self.estado is None:
+            return (0, 0, 0)
+        return tuple(self.estado.questoes.get((equipe_id, questao_id), (0, 0, 0)))
+
+    def matriz(self, equipe_ids: list[int], questao_ids: list[int]) -> list[list[tuple[int, int, int]]]:
+        """Status grid, one row per team and one column per question."""
+        return [[self.status(e, q) for q in questao_ids] for e in equipe_ids]
+
+    def reiniciar(self) -> None:
+        """Drop the in-memory state; the next sincronizar() reloads from the snapshot."""
+        with self._lock:
+            self.estado = None
+
+    def _carregar_snapshot(self, db: Session) -> None:
+        snapshot = db.query(SnapshotPontuacao).order_by(SnapshotPontuacao.ultimo_evento_id.desc()).first()
+        if snapshot is None:
+            self.estado = EstadoPontuacao()
+        else:
+            self.estado = EstadoPontuacao.from_json(snapshot.estado)
+        self._ultimo_snapshot = self.estado.ultimo_evento
+
+    def _salvar_snapshot(self, db: Session) -> None:
+        # Own session, so a read never commits (or rolls back) the caller's pending work.
+        # If the caller's transaction already wrote, SQLite holds the write lock until it
+        # ends; skip instead of waiting on it, the next sincronizar() tries again.
+        if getattr(db.connection().connection.dbapi_connection, "in_transaction", False):
+            return
+        with Session(bind=db.get_bind()) as escrita:
+            escrita.add(SnapshotPontuacao(ultimo_evento_id=self.estado.ultimo_evento, estado=self.estado.to_json()))
+            escrita.commit()
+        self._ultimo_snapshot = self.estado.ultimo_evento
+
+
+def verificar_eventos(db: Session) -> list[dict]:
+    """Fold the whole event log from scratch and return teams whose placar disagrees."""
+    estado = EstadoPontuacao()
+    for evento in db.query(EventoPontuacao).order_by(EventoPontuacao.id).yield_per(1000):
+        estado.aplicar(evento)
+
+    placar = dict(db.query(Placar.equipe_id, Placar.pontos).all())
+    divergencias = []
+    for equipe_id in sorted(set(placar)):
+        if estado.totais.get(equipe_id, 0) != placar[equipe_id]:
+            divergencias.append(
+                {"equipe_id": equipe_id, "placar": placar[equipe_id], "eventos": estado.totais.get(equipe_id, 0)}
+            )
+    return divergencias
+
+
+# Process-wide engine shared by every session
+motor = MotorPontuacao()
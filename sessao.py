@@ -0,0 +1,47 @@
+"""Per-rerun database session for Streamlit pages.
+
+    with sessao_pagina() as db:
+        ...page body...
+
+The session is opened on first use, so reruns that never query (cached views, the
+login screen) never check out a connection. It is closed when the block exits, also
+on ``st.stop()`` and ``st.rerun()``, which leave the script by raising. Per-rerun
+query counts and timings are kept by ``diagnostico.medir_pagina``.
+"""
+
+import contextlib
+
+from sqlalchemy.orm import Session
+
+from database import get_db
+
+
+class SessaoPagina:
+    """Session proxy that opens the real session on first attribute access."""
+
+    def __init__(self, factory=get_db):
+        self._factory = factory
+        self._db: Session | None = None
+
+    @property
+    def aberta(self) -> bool:
+        return self._db is not None
+
+    def __getattr__(self, nome):
+        if self._db is None:
+            self._db = self._factory()
+        return getattr(self._db, nome)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+@contextlib.contextmanager
+def sessao_pagina(factory=get_db):
+    sessao = SessaoPagina(factory)
+    try:
+        yield sessao
+    finally:
+        sessao.close()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import api
+from cache import VersionedCache, _digest_ranking
+
+LEADERBOARDS = {
+    "geral": [{"equipe": "Equipe A", "pontos": 100}, {"equipe": "Equipe B", "pontos": 80}],
+    "por_regata": {1: {"nome": "Regata 1", "ranking": [{"equipe": "Equipe B", "pontos": 80}]}},
+    "por_nivel": {"facil": [{"equipe": "Equipe A", "pontos": 100}]},
+    "regata_ativa": 1,
+}
+
+
+def _get(query: str = "", headers: dict | None = None) -> tuple[int, dict, bytes]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/leaderboard",
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    mensagens = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(mensagem):
+        mensagens.append(mensagem)
+
+    asyncio.run(api.app(scope, receive, send))
+    inicio = mensagens[0]
+    corpo = b"".join(m.get("body", b"") for m in mensagens[1:])
+    return inicio["status"], {k.decode(): v.decode() for k, v in inicio["headers"]}, corpo
+
+
+def _cache(monkeypatch):
+    chamadas = []
+
+    def loader():
+        chamadas.append(1)
+        return LEADERBOARDS
+
+    monkeypatch.setattr(api, "leaderboard_cache", VersionedCache(loader, digest=_digest_ranking))
+    return chamadas
+
+
+def test_leaderboard_json_com_etag(monkeypatch):
+    chamadas = _cache(monkeypatch)
+
+    status, headers, corpo = _get()
+    assert status == 200
+    assert json.loads(corpo)["ranking"] == LEADERBOARDS["geral"]
+    assert headers["cache-control"].startswith("public, max-age=")
+
+    monkeypatch.setattr(api, "API_TTL", 0.5)
+    assert _get()[1]["cache-control"] == "public, max-age=1"
+
+    status, _, corpo = _get(headers={"If-None-Match": headers["etag"]})
+    assert status == 304
+    assert corpo == b""
+    assert len(chamadas) == 1
+
+
+def test_leaderboard_visoes(monkeypatch):
+    _cache(monkeypatch)
+
+    _, headers_geral, _ = _get()
+    status, headers, corpo = _get("visao=ativa")
+    assert status == 200
+    assert json.loads(corpo)["ranking"] == [{"equipe": "Equipe B", "pontos": 80}]
+    assert headers["etag"] != headers_geral["etag"]
+
+    assert json.loads(_get("visao=nivel-facil")[2])["ranking"][0]["equipe"] == "Equipe A"
+    assert _get("visao=regata-9")[0] == 404
+    assert _get("visao=qualquer")[0] == 404
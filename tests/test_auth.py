@@ -1,5 +1,11 @@
 import pytest
-from auth import hash_password, verify_password
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import auth
+from auth import hash_password, verify_password, precisa_rehash, autenticar, emitir_token, ler_token, restaurar_sessao
+from database import Base
+from models import User
 
 
 def test_hash_and_verify_password():
@@ -8,3 +14,69 @@ def test_hash_and_verify_password():
     assert hashed != password
     assert verify_password(password, hashed) is True
     assert verify_password("errada", hashed) is False
+
+
+def test_custo_configuravel_e_rehash(monkeypatch):
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 5)
+    hashed = hash_password("senha123")
+    assert hashed.split("$")[2] == "05"
+    assert precisa_rehash(hashed) is False
+    assert precisa_rehash(hash_password("senha123", rounds=4)) is True
+
+
+def test_autenticar_refaz_hash_com_custo_antigo(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(User(username="juiz1", password_hash=hash_password("senha123", rounds=4), role="juiz"))
+        db.commit()
+
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 5)
+    assert autenticar(Session, User, "juiz1", "errada") is None
+    assert autenticar(Session, User, "ninguem", "senha123") is None
+    user = autenticar(Session, User, "juiz1", "senha123")
+    assert user == {"id": 1, "username": "juiz1", "role": "juiz", "token_versao": 0}
+    with Session() as db:
+        assert db.query(User.password_hash).scalar().split("$")[2] == "05"
+
+
+def test_token_assinado():
+    user = {"id": 1, "username": "juiz1", "role": "juiz"}
+    token = emitir_token(user)
+    assert ler_token(token) == user
+
+    payload, _, assinatura = token.partition(".")
+    adulterado = emitir_token({**user, "role": "admin"}).partition(".")[0]
+    assert ler_token(f"{adulterado}.{assinatura}") is None
+    assert ler_token(f"{payload}.x") is None
+    assert ler_token(emitir_token(user, ttl=-1)) is None
+
+
+@pytest.mark.parametrize("token", ["", "abc", "abc.déf", "é.é", "..."])
+def test_token_malformado(token):
+    assert ler_token(token) is None
+
+
+def test_restaurar_sessao_revogada():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all([
+            User(username="juiz1", password_hash="x", role="juiz"),
+            User(username="juiz2", password_hash="x", role="juiz"),
+        ])
+        db.commit()
+    token1 = emitir_token({"id": 1, "username": "juiz1", "role": "juiz", "token_versao": 0})
+    token2 = emitir_token({"id": 2, "username": "juiz2", "role": "juiz", "token_versao": 0})
+    assert restaurar_sessao(Session, User, token1)["username"] == "juiz1"
+
+    with Session() as db:
+        db.get(User, 1).token_versao += 1  # password changed
+        db.delete(db.get(User, 2))
+        db.commit()
+    assert restaurar_sessao(Session, User, token1) is None
+    assert restaurar_sessao(Session, User, token2) is None
+    admin = emitir_token({"id": 1, "username": "juiz1", "role": "admin", "token_versao": 1})
+    assert restaurar_sessao(Session, User, admin) is None
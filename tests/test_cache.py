@@ -0,0 +1,56 @@
+import threading
+from cache import VersionedCache
+
+
+def test_recalcula_apenas_apos_invalidacao():
+    chamadas = []
+
+    def loader():
+        chamadas.append(1)
+        return len(chamadas)
+
+    cache = VersionedCache(loader)
+    primeiro = cache.get()
+    assert primeiro.value == 1
+    assert cache.get() is primeiro
+    assert len(chamadas) == 1
+
+    assert cache.invalidate() == primeiro.version + 1
+    segundo = cache.get()
+    assert segundo.value == 2
+    assert segundo.version > primeiro.version
+
+
+def test_leitores_concorrentes_compartilham_um_carregamento():
+    chamadas = []
+    liberar = threading.Event()
+
+    def loader():
+        chamadas.append(1)
+        liberar.wait(timeout=2)
+        return "ranking"
+
+    cache = VersionedCache(loader)
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(cache.get())) for _ in range(20)]
+    for t in threads:
+        t.start()
+    liberar.set()
+    for t in threads:
+        t.join()
+
+    assert len(chamadas) == 1
+    assert len({id(r) for r in resultados}) == 1
+
+
+def test_max_age_recarrega_snapshot_antigo():
+    valores = iter([("A", 1), ("A", 1), ("A", 2)])
+    cache = VersionedCache(lambda: next(valores), digest=repr)
+
+    primeiro = cache.get()
+    assert cache.get(max_age=60) is primeiro
+    segundo = cache.get(max_age=0)
+    assert segundo is not primeiro
+    # Same content, same digest: viewers have nothing to re-render
+    assert segundo.digest == primeiro.digest
+    assert cache.get(max_age=0).digest != primeiro.digest
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import Regata, Questao
+from consultas import QuestaoResumo, carregar_regata_ativa, listar_questoes
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    regata = Regata(nome="Regata 1", ativa=True)
+    session.add(regata)
+    session.commit()
+    session.add_all([
+        Questao(regata_id=regata.id, nivel="facil", enunciado="Resolva $2x + 3 = 7$. Qual o valor de $x$?"),
+        Questao(regata_id=regata.id, nivel="medio", enunciado="Geometria", imagem_filename="q2.png"),
+        Questao(regata_id=regata.id, nivel="dificil", enunciado=""),
+    ])
+    session.commit()
+    session.expunge_all()
+
+    yield session
+    session.close()
+
+
+def test_colunas_pesadas_sao_adiadas(db):
+    questao = db.query(Questao).first()
+    assert "enunciado" not in questao.__dict__
+    assert "imagem" not in questao.__dict__
+
+
+def test_listar_questoes_carrega_enunciado(db):
+    regata = db.query(Regata).first()
+    questoes = listar_questoes(db, regata.id)
+    assert [q.nivel for q in questoes] == ["facil", "medio", "dificil"]
+    assert all("enunciado" in q.__dict__ for q in questoes)
+    assert all("imagem" not in q.__dict__ for q in questoes)
+
+
+def test_carregar_regata_ativa(db):
+    ativa = carregar_regata_ativa(db)
+    assert (ativa.id, ativa.nome) == (1, "Regata 1")
+    assert [q.nivel for q in ativa.questoes] == ["facil", "medio", "dificil"]
+    assert ativa.questoes[0].enunciado.startswith("Resolva")
+    assert ativa.resumo == (
+        QuestaoResumo(1, "facil", "Resolva $2x + 3 = 7$. Qual o v"),
+        QuestaoResumo(2, "medio", "q2.png"),
+        QuestaoResumo(3, "dificil", "Sem titulo"),
+    )
+
+    db.query(Regata).update({"ativa": False})
+    assert carregar_regata_ativa(db) is None
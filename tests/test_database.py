@@ -0,0 +1,156 @@
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from database import Base, create_db_engine
+from models import User, Equipe, Regata, Questao, Tentativa
+from scoring import registrar_tentativa, corrigir_tentativa, calcular_leaderboard, verificar_placar, verificar_eventos
+
+N_EQUIPES = 8
+N_QUESTOES = 6
+N_LEITORES = 8
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'stress.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_pragmas_aplicados(engine):
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+
+
+def test_leitores_e_escritores_concorrentes_sem_lock(engine):
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    with Session() as db:
+        juiz = User(username="juiz1", password_hash="hash", role="juiz")
+        regata = Regata(nome="Regata 1", ativa=True)
+        equipes = [Equipe(nome=f"Equipe {i}") for i in range(N_EQUIPES)]
+        db.add_all([juiz, regata, *equipes])
+        db.commit()
+        questoes = [
+            Questao(regata_id=regata.id, nivel="facil", enunciado=f"Q{i}") for i in range(N_QUESTOES)
+        ]
+        db.add_all(questoes)
+        db.commit()
+        juiz_id = juiz.id
+        equipe_ids = [e.id for e in equipes]
+        questao_ids = [q.id for q in questoes]
+
+    erros = []
+    escrevendo = threading.Event()
+    escrevendo.set()
+
+    def escritor(equipe_id):
+        # One judge per team: errs twice, then scores on the 3rd attempt
+        try:
+            with Session() as db:
+                for questao_id in questao_ids:
+                    for acertou in (False, False, True):
+                        result = registrar_tentativa(db, equipe_id, questao_id, acertou, juiz_id)
+                        assert "erro" not in result
+        except Exception as exc:  # noqa: BLE001 - collected and asserted below
+            erros.append(exc)
+
+    def leitor():
+        try:
+            with Session() as db:
+                while escrevendo.is_set():
+                    calcular_leaderboard(db)
+                    db.rollback()
+        except Exception as exc:  # noqa: BLE001
+            erros.append(exc)
+
+    escritores = [threading.Thread(target=escritor, args=(e,)) for e in equipe_ids]
+    leitores = [threading.Thread(target=leitor) for _ in range(N_LEITORES)]
+    for t in leitores + escritores:
+        t.start()
+    for t in escritores:
+        t.join()
+    escrevendo.clear()
+    for t in leitores:
+        t.join()
+
+    assert erros == []
+    with Session() as db:
+        assert db.query(Tentativa).count() == N_EQUIPES * N_QUESTOES * 3
+        assert verificar_placar(db) == []
+        ranking = calcular_leaderboard(db)
+        assert all(r["pontos"] == N_QUESTOES * 50 for r in ranking)
+
+
+def test_registro_concorrente_mesma_questao_sem_numero_duplicado(engine):
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    with Session() as db:
+        equipe = Equipe(nome="Equipe A")
+        regata = Regata(nome="Regata 1", ativa=True)
+        db.add_all([equipe, regata])
+        db.commit()
+        questao = Questao(regata_id=regata.id, nivel="facil", enunciado="Q")
+        db.add(questao)
+        db.commit()
+        equipe_id, questao_id = equipe.id, questao.id
+
+    n_juizes = 12
+    largada = threading.Barrier(n_juizes)
+    resultados = []
+
+    def juiz(juiz_id):
+        with Session() as db:
+            largada.wait()
+            resultados.append(registrar_tentativa(db, equipe_id, questao_id, False, juiz_id))
+
+    threads = [threading.Thread(target=juiz, args=(i,)) for i in range(n_juizes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    aceitos = sorted(r["numero"] for r in resultados if "erro" not in r)
+    assert aceitos == [1, 2, 3]
+    assert sum(1 for r in resultados if "erro" in r) == n_juizes - 3
+    with Session() as db:
+        numeros = [t.numero for t in db.query(Tentativa).order_by(Tentativa.numero)]
+        assert numeros == [1, 2, 3]
+
+
+def test_correcao_concorrente_mesma_tentativa_consistente(engine):
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    with Session() as db:
+        equipe = Equipe(nome="Equipe A")
+        regata = Regata(nome="Regata 1", ativa=True)
+        db.add_all([equipe, regata])
+        db.commit()
+        questao = Questao(regata_id=regata.id, nivel="facil", enunciado="Q")
+        db.add(questao)
+        db.commit()
+        registrar_tentativa(db, equipe.id, questao.id, False, 1)
+        tentativa_id = db.query(Tentativa.id).scalar()
+
+    n_juizes = 7
+    largada = threading.Barrier(n_juizes)
+    resultados = []
+
+    def juiz(juiz_id):
+        with Session() as db:
+            largada.wait()
+            resultados.append(corrigir_tentativa(db, tentativa_id, juiz_id))
+
+    threads = [threading.Thread(target=juiz, args=(i,)) for i in range(n_juizes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # An odd number of flips leaves the attempt correct, each flip applied exactly once
+    assert sorted(r["acertou"] for r in resultados) == [False] * 3 + [True] * 4
+    with Session() as db:
+        assert db.get(Tentativa, tentativa_id).acertou is True
+        assert verificar_placar(db) == []
+        assert verificar_eventos(db) == []
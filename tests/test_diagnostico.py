@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from database import observar_consultas
+from diagnostico import Diagnostico, Medicao, diagnostico, medir_pagina, percentil
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    observar_consultas(engine)
+    diagnostico.reiniciar()
+    yield engine
+    diagnostico.reiniciar()
+
+
+def test_percentil():
+    valores = list(range(1, 101))
+    assert percentil(valores, 0.5) == 51
+    assert percentil(valores, 0.99) == 100
+    assert percentil([7], 0.95) == 7
+
+
+def test_medir_pagina_conta_consultas(engine):
+    class Parar(Exception):
+        pass
+
+    with pytest.raises(Parar):
+        with medir_pagina("Leaderboard") as medicao:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            raise Parar  # what st.stop() / st.rerun() do
+
+    # Statements outside a page are not attributed to it
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+
+    assert medicao.consultas == 2
+    assert 0 < medicao.tempo_db <= medicao.tempo_total
+    [pagina] = diagnostico.por_pagina()
+    assert (pagina["pagina"], pagina["reruns"], pagina["consultas"]["p50"]) == ("Leaderboard", 1, 2)
+
+
+def test_consultas_lentas(engine):
+    diagnostico.limiar_ms = 0
+    try:
+        with medir_pagina("Juiz"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 42"))
+    finally:
+        diagnostico.limiar_ms = 100
+    [lenta] = diagnostico.lentas()
+    assert (lenta.pagina, lenta.sql) == ("Juiz", "SELECT 42")
+
+
+def test_por_sessao_e_despejo(tmp_path):
+    diag = Diagnostico(sessoes=2)
+    for i, sessao in enumerate(["a", "b", "a", "c"]):
+        diag.registrar(Medicao("Questoes", sessao, inicio=100.0 + i * 30, consultas=i, tempo_total=0.01))
+
+    sessoes = diag.por_sessao()
+    assert [s["sessao"] for s in sessoes] == ["c", "a"]  # "b" was least recently seen
+    assert (sessoes[1]["reruns"], sessoes[1]["consultas"], sessoes[1]["reruns_por_min"]) == (2, 2, 1.0)
+    assert diag.por_pagina()[0]["reruns_por_min"] == 2.0
+    assert [m.consultas for m in diag.recentes(3)] == [3, 2, 1]
+
+    caminho = diag.despejar(str(tmp_path / "diag.json"))
+    with open(caminho) as f:
+        dados = json.load(f)
+    assert dados["paginas"][0]["reruns"] == 4
+    assert len(dados["amostras"]["Questoes"]) == 4
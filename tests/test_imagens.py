@@ -0,0 +1,96 @@
+import io
+import os
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import Regata, Questao
+import imagens
+
+
+@pytest.fixture(autouse=True)
+def imagens_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(imagens, "IMAGENS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _png(largura=40, altura=20, cor="red") -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (largura, altura), cor).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_salvar_imagem_por_hash(imagens_dir):
+    dados = _png()
+    meta = imagens.salvar_imagem(dados)
+    assert meta["imagem_mime"] == "image/png"
+    assert meta["imagem_tamanho"] == len(dados)
+    assert (meta["imagem_largura"], meta["imagem_altura"]) == (40, 20)
+    assert imagens.ler_imagem(meta["imagem_hash"], meta["imagem_mime"]) == dados
+    assert imagens.url_imagem(meta["imagem_hash"], meta["imagem_mime"]).endswith(f"{meta['imagem_hash']}.png")
+
+    # Same content is stored once
+    assert imagens.salvar_imagem(dados) == meta
+    assert len(os.listdir(imagens_dir)) == 1
+
+
+def test_salvar_imagem_rejeita_formato_invalido():
+    with pytest.raises(OSError):
+        imagens.salvar_imagem(b"nao e imagem")
+
+
+def test_migrar_blobs_move_para_arquivo():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    regata = Regata(nome="Regata 1")
+    db.add(regata)
+    db.commit()
+    dados = _png(cor="blue")
+    db.add_all([
+        Questao(regata_id=regata.id, nivel="facil", enunciado="Q1", imagem=dados),
+        Questao(regata_id=regata.id, nivel="facil", enunciado="Q2", imagem=b"corrompida"),
+    ])
+    db.commit()
+
+    with engine.begin() as conn, pytest.warns(UserWarning):
+        assert imagens.migrar_blobs(conn) == 1
+
+    q1, q2 = db.query(Questao).order_by(Questao.id).all()
+    db.refresh(q1)
+    assert q1.imagem is None
+    assert q1.imagem_mime == "image/webp"
+    assert (q1.imagem_largura, q1.imagem_altura) == (40, 20)
+    assert os.path.exists(imagens.caminho_imagem(q1.imagem_hash, q1.imagem_mime))
+    assert q2.imagem == b"corrompida" and q2.imagem_hash is None
+
+
+def test_processar_upload_normaliza_e_gera_miniatura():
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    exif[0x010F] = "Camera X"  # Make
+    Image.new("RGB", (4000, 3000), "green").save(buf, format="JPEG", exif=exif)
+    original = buf.getvalue()
+
+    meta = imagens.processar_upload(original)
+    assert meta["imagem_mime"] == "image/webp"
+    # Orientation applied, then capped to IMAGEM_LADO_MAX
+    assert (meta["imagem_largura"], meta["imagem_altura"]) == (1200, 1600)
+    assert meta["imagem_tamanho"] < len(original)
+
+    exibicao = imagens.ler_imagem(meta["imagem_hash"], meta["imagem_mime"])
+    with Image.open(io.BytesIO(exibicao)) as img:
+        assert not img.getexif()
+
+    with Image.open(imagens.caminho_miniatura(meta["imagem_hash"])) as thumb:
+        assert max(thumb.size) == imagens.MINIATURA_LADO
+
+
+def test_url_miniatura_gera_para_imagens_antigas():
+    meta = imagens.salvar_imagem(_png(800, 400))
+    url = imagens.url_miniatura(meta["imagem_hash"], meta["imagem_mime"])
+    assert url.endswith(".thumb.webp")
+    with Image.open(imagens.caminho_miniatura(meta["imagem_hash"])) as thumb:
+        assert thumb.size == (300, 150)
@@ -76,3 +76,21 @@ def test_create_tentativa(db):
     db.commit()
     assert tentativa.pontos == 100
     assert tentativa.numero == 1
+
+
+def test_tentativa_numero_unico_por_equipe_e_questao(db):
+    from sqlalchemy.exc import IntegrityError
+
+    equipe = Equipe(nome="Equipe Gama")
+    regata = Regata(nome="Regata 1", ativa=True)
+    db.add_all([equipe, regata])
+    db.commit()
+    questao = Questao(regata_id=regata.id, nivel="facil", enunciado="Questao teste")
+    db.add(questao)
+    db.commit()
+
+    db.add(Tentativa(equipe_id=equipe.id, questao_id=questao.id, numero=1, acertou=False, pontos=0, juiz_id=1))
+    db.commit()
+    db.add(Tentativa(equipe_id=equipe.id, questao_id=questao.id, numero=1, acertou=True, pontos=100, juiz_id=1))
+    with pytest.raises(IntegrityError):
+        db.commit()
@@ -0,0 +1,8 @@
+from notificacoes import Canal
+
+
+def test_publicar_incrementa_sequencia():
+    canal = Canal()
+    assert canal.seq == 0
+    assert canal.publicar() == 1
+    assert canal.publicar() == 2
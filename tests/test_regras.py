@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+import regras
+from regras import RegrasPontuacao, carregar_regras
+
+
+def test_pontos_com_multiplicador_por_nivel():
+    r = RegrasPontuacao({1: 100, 2: 80, 3: 50}, {"dificil": 1.5})
+    assert r.pontos(1, "facil") == 100
+    assert r.pontos(3, "dificil") == 75
+    assert r.pontos(4, "dificil") == 0
+    assert r.pontos(1, "dificil", acertou=False) == 0
+
+
+def test_max_tentativas_explicito_e_validado():
+    assert RegrasPontuacao.from_dict({"pontos_por_tentativa": {"1": 100}}).max_tentativas == 3
+    assert RegrasPontuacao.from_dict({"max_tentativas": 5}).max_tentativas == 5
+    for invalido in (0, -1, "3", 2.5, True):
+        with pytest.raises(ValueError):
+            RegrasPontuacao.from_dict({"max_tentativas": invalido})
+
+
+def test_carregar_regras_sem_arquivo_usa_padrao(tmp_path):
+    assert carregar_regras(str(tmp_path / "nada.json")) == RegrasPontuacao()
+
+
+def test_regras_atuais_recarrega_quando_arquivo_muda(tmp_path, monkeypatch):
+    caminho = tmp_path / "regras.json"
+    monkeypatch.setattr(regras, "REGRAS_PATH", str(caminho))
+    monkeypatch.setattr(regras, "_cache", (None, RegrasPontuacao()))
+    assert regras.regras_atuais().pontos(1, None) == 100
+
+    caminho.write_text(json.dumps({"pontos_por_tentativa": {"1": 150}}))
+    assert regras.regras_atuais().pontos(1, None) == 150
+    assert regras.regras_atuais() is regras.regras_atuais()
@@ -0,0 +1,28 @@
+import json
+
+from render import placar_json, cartao_questao
+
+RANKING = (
+    {"posicao": 1, "equipe": "Equipe A", "pontos": 180},
+    {"posicao": 2, "equipe": "Equipe B", "pontos": 80},
+    {"posicao": 2, "equipe": "Equipe <C>", "pontos": 80},
+)
+
+
+def test_placar_json_compacto():
+    dados = placar_json(RANKING, None)
+    assert json.loads(dados) == [["Equipe A", 180, 1], ["Equipe B", 80, 2], ["Equipe <C>", 80, 2]]
+    assert " " not in dados.replace("Equipe ", "")
+
+
+def test_placar_json_reutiliza_por_digest():
+    dados = placar_json(RANKING, "d1")
+    assert placar_json(RANKING, "d1") is dados
+    assert placar_json(RANKING[:1], "d2") != dados
+
+
+def test_cartao_questao():
+    enunciado, imagem = cartao_questao("  Resolva $x + 1 = 2$ ", "abc", "image/webp")
+    assert enunciado == "Resolva $x + 1 = 2$"
+    assert 'src="app/static/imagens/abc' in imagem
+    assert cartao_questao("Sem imagem", None, None) == ("Sem imagem", None)
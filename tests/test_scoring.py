@@ -2,8 +2,21 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from database import Base
-from models import User, Equipe, Regata, Questao, Tentativa
-from scoring import registrar_tentativa, calcular_leaderboard
+from models import User, Equipe, Regata, Questao, Tentativa, Placar, EventoPontuacao, SnapshotPontuacao
+from scoring import (
+    registrar_tentativa,
+    registrar_tentativas_lote,
+    corrigir_tentativa,
+    calcular_leaderboard,
+    calcular_leaderboards,
+    verificar_placar,
+    reconstruir_placar,
+    verificar_eventos,
+    recalcular_pontos,
+    Classificacao,
+    MotorPontuacao,
+)
+from regras import RegrasPontuacao
 
 
 @pytest.fixture
@@ -80,6 +93,27 @@ def test_bloqueia_apos_3_tentativas(db):
     assert result["erro"] == "Equipe ja esgotou as 3 tentativas nesta questao."
 
 
+def test_limite_de_tentativas_vem_das_regras(db, monkeypatch):
+    import scoring
+
+    monkeypatch.setattr(scoring, "regras_atuais", lambda: RegrasPontuacao({1: 100, 2: 60}, max_tentativas=4))
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    for _ in range(3):
+        registrar_tentativa(db, equipe_a.id, questao.id, False, juiz.id)
+    # Past the points table the attempt is accepted but worth nothing
+    result = registrar_tentativa(db, equipe_a.id, questao.id, True, juiz.id)
+    assert (result["numero"], result["pontos"]) == (4, 0)
+
+    for _ in range(4):
+        registrar_tentativa(db, equipe_b.id, questao.id, False, juiz.id)
+    result = registrar_tentativa(db, equipe_b.id, questao.id, True, juiz.id)
+    assert result["erro"] == "Equipe ja esgotou as 4 tentativas nesta questao."
+
+
 def test_bloqueia_apos_acerto(db):
     equipe = db.query(Equipe).filter_by(nome="Equipe A").first()
     questao = db.query(Questao).first()
@@ -122,3 +156,297 @@ def test_calcular_leaderboard(db):
     assert ranking[0]["pontos"] == 100
     assert ranking[1]["equipe"] == "Equipe B"
     assert ranking[1]["pontos"] == 80
+
+
+def test_placar_acompanha_registro_e_correcao(db):
+    equipe = db.query(Equipe).filter_by(nome="Equipe A").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    registrar_tentativa(db, equipe.id, questao.id, False, juiz.id)
+    registrar_tentativa(db, equipe.id, questao.id, True, juiz.id)
+    assert db.get(Placar, equipe.id).pontos == 80
+
+    primeira = db.query(Tentativa).filter_by(equipe_id=equipe.id, numero=1).first()
+    result = corrigir_tentativa(db, primeira.id)
+    assert result["acertou"] is True
+    assert result["pontos"] == 100
+    db.expire_all()
+    assert db.get(Placar, equipe.id).pontos == 180
+    assert verificar_placar(db) == []
+
+
+def test_leaderboard_inclui_equipes_sem_pontos(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    registrar_tentativa(db, equipe_a.id, questao.id, True, juiz.id)
+
+    ranking = calcular_leaderboard(db)
+    assert ranking == [
+        {"posicao": 1, "equipe": "Equipe A", "pontos": 100},
+        {"posicao": 2, "equipe": "Equipe B", "pontos": 0},
+    ]
+
+
+def test_reconstruir_placar_reporta_e_corrige_divergencia(db):
+    equipe = db.query(Equipe).filter_by(nome="Equipe A").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    registrar_tentativa(db, equipe.id, questao.id, True, juiz.id)
+    db.get(Placar, equipe.id).pontos = 7
+    db.commit()
+
+    divergencias = verificar_placar(db)
+    assert divergencias == [{"equipe_id": equipe.id, "placar": 7, "tentativas": 100}]
+
+    assert reconstruir_placar(db) == divergencias
+    assert verificar_placar(db) == []
+    assert calcular_leaderboard(db)[0]["pontos"] == 100
+
+
+def test_log_de_eventos_guarda_correcoes(db):
+    equipe = db.query(Equipe).filter_by(nome="Equipe A").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    registrar_tentativa(db, equipe.id, questao.id, False, juiz.id)
+    tentativa = db.query(Tentativa).first()
+    corrigir_tentativa(db, tentativa.id, juiz.id)
+
+    eventos = db.query(EventoPontuacao).order_by(EventoPontuacao.id).all()
+    assert [(e.tipo, e.acertou, e.pontos, e.delta) for e in eventos] == [
+        ("registrada", False, 0, 0),
+        ("corrigida", True, 100, 100),
+    ]
+    assert verificar_eventos(db) == []
+
+
+def test_motor_replay_a_partir_de_snapshot(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    motor = MotorPontuacao(snapshot_intervalo=2)
+    registrar_tentativa(db, equipe_a.id, questao.id, False, juiz.id)
+    registrar_tentativa(db, equipe_a.id, questao.id, True, juiz.id)
+    assert motor.sincronizar(db) == 2
+    assert db.query(SnapshotPontuacao).count() == 1
+
+    registrar_tentativa(db, equipe_b.id, questao.id, True, juiz.id)
+    assert motor.sincronizar(db) == 1
+    assert motor.total(equipe_a.id) == 80
+    assert motor.total(equipe_b.id) == 100
+    assert motor.estado.questoes[(equipe_a.id, questao.id)] == [2, 1, 80]
+
+    # A fresh engine resumes from the snapshot and replays only the tail
+    novo = MotorPontuacao(snapshot_intervalo=2)
+    assert novo.sincronizar(db) == 1
+    assert novo.estado.totais == motor.estado.totais
+    assert novo.estado.questoes == motor.estado.questoes
+
+
+def test_motor_snapshot_nao_commita_sessao_do_chamador(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'motor.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        juiz = User(username="juiz1", password_hash="hash", role="juiz")
+        regata = Regata(nome="Regata 1", ativa=True)
+        db.add_all([juiz, Equipe(nome="Equipe A"), regata])
+        db.commit()
+        questao = Questao(regata_id=regata.id, nivel="facil", enunciado="Q")
+        db.add(questao)
+        db.commit()
+        registrar_tentativa(db, 1, questao.id, True, juiz.id)
+
+        db.add(Equipe(nome="Pendente"))
+        db.flush()
+        assert MotorPontuacao(snapshot_intervalo=1, salvar_snapshots=False).sincronizar(db) == 1
+        assert db.query(SnapshotPontuacao).count() == 0
+        db.rollback()
+
+        # Pending work is neither committed nor waited on; the snapshot is retried later
+        motor = MotorPontuacao(snapshot_intervalo=1)
+        db.add(Equipe(nome="Pendente"))
+        assert motor.sincronizar(db) == 1
+        db.rollback()
+        assert db.query(Equipe).filter_by(nome="Pendente").count() == 0
+        assert db.query(SnapshotPontuacao).count() == 0
+
+        motor.sincronizar(db)
+        assert db.query(SnapshotPontuacao).count() == 1
+
+
+def test_calcular_leaderboards_por_regata_e_nivel(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao_facil = db.query(Questao).first()
+    juiz = db.query(User).first()
+    regata_1 = db.query(Regata).first()
+    regata_1.ativa = False
+    regata_2 = Regata(nome="Regata 2", ativa=True)
+    db.add(regata_2)
+    db.commit()
+    questao_dificil = Questao(regata_id=regata_2.id, nivel="dificil", enunciado="Dificil")
+    db.add(questao_dificil)
+    db.commit()
+
+    registrar_tentativa(db, equipe_a.id, questao_facil.id, True, juiz.id)  # A: 100 facil, regata 1
+    registrar_tentativa(db, equipe_b.id, questao_dificil.id, False, juiz.id)
+    registrar_tentativa(db, equipe_b.id, questao_dificil.id, True, juiz.id)  # B: 80 dificil, regata 2
+
+    result = calcular_leaderboards(db)
+    assert result["geral"] == [
+        {"posicao": 1, "equipe": "Equipe A", "pontos": 100},
+        {"posicao": 2, "equipe": "Equipe B", "pontos": 80},
+    ]
+    assert result["regata_ativa"] == regata_2.id
+    assert result["por_regata"][regata_1.id]["nome"] == "Regata 1"
+    assert result["por_regata"][regata_1.id]["ranking"] == [
+        {"posicao": 1, "equipe": "Equipe A", "pontos": 100},
+        {"posicao": 2, "equipe": "Equipe B", "pontos": 0},
+    ]
+    assert result["por_regata"][regata_2.id]["ranking"][0] == {"posicao": 1, "equipe": "Equipe B", "pontos": 80}
+    assert result["por_nivel"]["facil"][0] == {"posicao": 1, "equipe": "Equipe A", "pontos": 100}
+    assert result["por_nivel"]["dificil"][0] == {"posicao": 1, "equipe": "Equipe B", "pontos": 80}
+    assert all(r["pontos"] == 0 for r in result["por_nivel"]["medio"])
+
+
+def test_recalcular_pontos_aplica_novas_regras(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    registrar_tentativa(db, equipe_a.id, questao.id, True, juiz.id)
+    registrar_tentativa(db, equipe_b.id, questao.id, False, juiz.id)
+    registrar_tentativa(db, equipe_b.id, questao.id, True, juiz.id)
+
+    regras = RegrasPontuacao({1: 120, 2: 80, 3: 60}, {"facil": 0.5})
+    result = recalcular_pontos(db, regras)
+    assert result == {
+        "antes": {equipe_a.id: 100, equipe_b.id: 80},
+        "depois": {equipe_a.id: 60, equipe_b.id: 40},
+        "alteradas": 2,
+    }
+    assert [t.pontos for t in db.query(Tentativa).order_by(Tentativa.id)] == [60, 0, 40]
+    assert verificar_placar(db) == []
+    assert verificar_eventos(db) == []
+
+    motor = MotorPontuacao()
+    motor.sincronizar(db)
+    # Recomputing moves points only; attempt and hit counts are untouched
+    assert motor.estado.questoes[(equipe_b.id, questao.id)] == [2, 1, 40]
+
+
+def test_recalcular_pontos_simulado_nao_grava(db):
+    equipe = db.query(Equipe).filter_by(nome="Equipe A").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+    registrar_tentativa(db, equipe.id, questao.id, True, juiz.id)
+
+    result = recalcular_pontos(db, RegrasPontuacao({1: 10}), simular=True)
+    assert result["depois"] == {equipe.id: 10}
+    assert db.query(Tentativa.pontos).scalar() == 100
+    assert db.query(Placar.pontos).scalar() == 100
+    assert db.query(EventoPontuacao).count() == 1
+
+
+def test_motor_matriz_de_status(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    motor = MotorPontuacao()
+    motor.atualizar(db)
+    assert motor.status(equipe_a.id, questao.id) == (0, 0, 0)
+
+    registrar_tentativa(db, equipe_a.id, questao.id, False, juiz.id)
+    registrar_tentativa(db, equipe_a.id, questao.id, True, juiz.id)
+    registrar_tentativa(db, equipe_b.id, questao.id, False, juiz.id)
+    motor.atualizar(db)
+    assert motor.matriz([equipe_a.id, equipe_b.id], [questao.id]) == [[(2, 1, 80)], [(1, 0, 0)]]
+
+    # A write that did not publish is only picked up by an explicit sincronizar()
+    db.add(Tentativa(equipe_id=equipe_b.id, questao_id=questao.id, numero=2, acertou=False, pontos=0, juiz_id=juiz.id))
+    db.add(EventoPontuacao(
+        tipo="registrada", tentativa_id=99, equipe_id=equipe_b.id, questao_id=questao.id,
+        numero=2, acertou=False, pontos=0, delta=0,
+    ))
+    db.commit()
+    motor.atualizar(db)
+    assert motor.status(equipe_b.id, questao.id) == (1, 0, 0)
+    assert motor.sincronizar(db) == 1
+    assert motor.status(equipe_b.id, questao.id) == (2, 0, 0)
+
+
+def test_registrar_tentativas_lote_numera_em_ordem(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    resultados = registrar_tentativas_lote(
+        db,
+        [
+            (equipe_a.id, questao.id, False),
+            (equipe_b.id, questao.id, True),
+            (equipe_a.id, questao.id, True),
+            (equipe_b.id, questao.id, True),
+        ],
+        juiz.id,
+    )
+    assert resultados == [
+        {"numero": 1, "acertou": False, "pontos": 0},
+        {"numero": 1, "acertou": True, "pontos": 100},
+        {"numero": 2, "acertou": True, "pontos": 80},
+        {"erro": "Equipe ja acertou esta questao."},
+    ]
+    assert db.query(Tentativa).count() == 3
+    assert verificar_placar(db) == []
+
+
+def test_classificacao_desempate_e_modos():
+    c = Classificacao()
+    c.definir(1, "Alfa", 100, alcancado_em=20.0)
+    c.definir(2, "Bravo", 100, alcancado_em=10.0)  # reached 100 first
+    c.definir(3, "Charlie", 80, alcancado_em=5.0)
+    c.definir(4, "Delta", 0)
+    c.definir(5, "Aurora", 0)
+
+    assert [r["equipe"] for r in c.ranking()] == ["Bravo", "Alfa", "Charlie", "Aurora", "Delta"]
+    assert [r["posicao"] for r in c.ranking("competicao")] == [1, 1, 3, 4, 4]
+    assert [r["posicao"] for r in c.ranking("densa")] == [1, 1, 2, 3, 3]
+    assert (c.posicao(3, "competicao"), c.posicao(3, "densa")) == (3, 2)
+
+    # Charlie overtakes; None keeps the previous tiebreak for Alfa
+    c.definir(3, "Charlie", 150, alcancado_em=30.0)
+    c.definir(1, "Alfa", 100)
+    assert [r["equipe"] for r in c.ranking()][:3] == ["Charlie", "Bravo", "Alfa"]
+    assert c.posicao(1) == 2
+
+    c.remover(2)
+    assert c.posicao(1, "densa") == 2
+    assert len(c) == 4
+
+
+def test_leaderboard_empate_ordenado_por_quem_pontuou_antes(db):
+    equipe_a = db.query(Equipe).filter_by(nome="Equipe A").first()
+    equipe_b = db.query(Equipe).filter_by(nome="Equipe B").first()
+    questao = db.query(Questao).first()
+    juiz = db.query(User).first()
+
+    registrar_tentativa(db, equipe_b.id, questao.id, True, juiz.id)
+    registrar_tentativa(db, equipe_a.id, questao.id, True, juiz.id)
+
+    ranking = calcular_leaderboard(db)
+    assert ranking == [
+        {"posicao": 1, "equipe": "Equipe B", "pontos": 100},
+        {"posicao": 1, "equipe": "Equipe A", "pontos": 100},
+    ]
+    assert calcular_leaderboards(db)["geral"] == ranking
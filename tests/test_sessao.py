@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from sessao import sessao_pagina
+
+
+@pytest.fixture
+def Session():
+    return sessionmaker(bind=create_engine("sqlite:///:memory:"))
+
+
+def test_sessao_aberta_apenas_quando_usada(Session):
+    with sessao_pagina(Session) as db:
+        assert not db.aberta
+
+    with sessao_pagina(Session) as db:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+        assert db.aberta
+    assert not db.aberta
+
+
+def test_sessao_fechada_quando_pagina_interrompida(Session):
+    class Parar(Exception):
+        pass
+
+    with pytest.raises(Parar):
+        with sessao_pagina(Session) as db:
+            db.execute(text("SELECT 1"))
+            raise Parar  # what st.stop() / st.rerun() do
+    assert not db.aberta
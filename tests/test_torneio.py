@@ -0,0 +1,32 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import Regata
+from benchmarks.torneio import gerar_torneio
+
+
+def _gerar(seed):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        torneio = gerar_torneio(db, equipes=8, regatas=2, questoes_por_nivel=2, seed=seed)
+        ativas = [id for (id,) in db.query(Regata.id).filter(Regata.ativa == True)]  # noqa: E712
+    return torneio, ativas
+
+
+def test_mesma_seed_gera_mesmo_torneio():
+    a, ativas = _gerar(7)
+    b, _ = _gerar(7)
+    assert a.tentativas == b.tentativas
+    assert ativas == [a.regata_ids[-1]]
+    assert all(len(q) == 6 for q in a.questoes.values())
+
+
+def test_tentativas_param_no_acerto():
+    torneio, _ = _gerar(3)
+    por_questao = {}
+    for equipe_id, questao_id, acertou in torneio.tentativas:
+        por_questao.setdefault((equipe_id, questao_id), []).append(acertou)
+    for resultados in por_questao.values():
+        assert len(resultados) <= 3
+        assert not any(resultados[:-1])
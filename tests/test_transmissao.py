@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, Equipe, Regata, Questao
+from scoring import registrar_tentativa, corrigir_tentativa
+from transmissao import FIM, Transmissor
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    regata = Regata(nome="Regata 1", ativa=True)
+    session.add_all([User(username="juiz1", password_hash="hash", role="juiz"), Equipe(nome="Equipe A"),
+                     Equipe(nome="Equipe B"), regata])
+    session.commit()
+    session.add_all([Questao(regata_id=regata.id, nivel="facil", enunciado=f"Q{i}") for i in range(3)])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _ids(db):
+    juiz = db.query(User).first().id
+    a, b = [e.id for e in db.query(Equipe).order_by(Equipe.id)]
+    questoes = [q.id for q in db.query(Questao).order_by(Questao.id)]
+    return juiz, a, b, questoes
+
+
+def _dados(mensagem: bytes) -> tuple[str, dict]:
+    linhas = dict(linha.split(": ", 1) for linha in mensagem.decode().strip().split("\n"))
+    return linhas["event"], json.loads(linhas["data"])
+
+
+def test_deltas_com_total_e_posicao(db):
+    juiz, a, b, (q1, q2, _) = _ids(db)
+    transmissor = Transmissor()
+    registrar_tentativa(db, a, q1, True, juiz)
+    assert transmissor.coletar(db) == []  # catch-up is not streamed
+
+    fila = transmissor.assinar()
+    registrar_tentativa(db, b, q1, True, juiz)
+    registrar_tentativa(db, b, q2, False, juiz)
+    transmissor.publicar(transmissor.coletar(db))
+
+    tipo, delta = _dados(fila.get_nowait())
+    assert tipo == "registrada"
+    assert delta == {
+        "equipe_id": b, "equipe": "Equipe B", "questao_id": q1, "numero": 1, "acertou": True,
+        "pontos": 100, "delta": 100, "total": 100, "posicao": 1,
+    }
+    assert _dados(fila.get_nowait())[1]["numero"] == 1
+
+    corrigir_tentativa(db, 1, juiz)
+    transmissor.publicar(transmissor.coletar(db))
+    tipo, delta = _dados(fila.get_nowait())
+    assert (tipo, delta["total"], delta["posicao"]) == ("corrigida", 0, 2)
+
+
+def test_retomada_pelo_ultimo_id(db):
+    juiz, a, b, (q1, q2, q3) = _ids(db)
+    transmissor = Transmissor(buffer=2)
+    transmissor.coletar(db)
+
+    for q in (q1, q2, q3):
+        registrar_tentativa(db, a, q, True, juiz)
+        transmissor.publicar(transmissor.coletar(db))
+
+    # Missed only event 3: replayed from the buffer
+    assert [_dados(m)[1]["questao_id"] for m in _esvaziar(transmissor.assinar(desde=2))] == [q3]
+    # Event 2 fell out of the buffer: the client must reset
+    assert [_dados(m)[0] for m in _esvaziar(transmissor.assinar(desde=0))] == ["reset"]
+
+
+def test_cliente_lento_e_desconectado(db):
+    juiz, a, b, questoes = _ids(db)
+    transmissor = Transmissor(fila=2)
+    transmissor.coletar(db)
+    rapido, lento = transmissor.assinar(), transmissor.assinar()
+
+    for q in questoes:
+        registrar_tentativa(db, a, q, False, juiz)
+        transmissor.publicar(transmissor.coletar(db))
+        _esvaziar(rapido)
+
+    assert _esvaziar(lento) == [FIM]
+    assert lento not in transmissor._assinantes
+    assert rapido in transmissor._assinantes
+
+
+def test_lote_maior_que_o_buffer_vira_reset(db):
+    juiz, a, b, questoes = _ids(db)
+    transmissor = Transmissor(buffer=2)
+    transmissor.coletar(db)
+    fila = transmissor.assinar()
+
+    for q in questoes:
+        registrar_tentativa(db, a, q, True, juiz)
+    transmissor.publicar(transmissor.coletar(db))
+    assert [_dados(m)[0] for m in _esvaziar(fila)] == ["reset"]
+
+
+def _esvaziar(fila) -> list:
+    itens = []
+    while not fila.empty():
+        itens.append(fila.get_nowait())
+    return itens
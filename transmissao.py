@@ -0,0 +1,179 @@
+"""Live stream of score deltas for overlays (Server-Sent Events, served by api.py).
+
+A single producer tails the scoring event log and turns every committed attempt,
+correction or recompute into a compact delta (team, question, attempt number, points,
+new total, new position). Each delta is serialized once and fanned out to subscriber
+queues, so the number of viewers never changes the database load.
+
+Backpressure: every subscriber has a bounded queue. A client that falls behind has its
+stream closed instead of slowing the producer down; it reconnects with Last-Event-ID
+and resumes from the ring buffer of recent deltas. When the gap is no longer in the
+buffer, the client gets a ``reset`` event and should refetch /api/leaderboard.
+"""
+
+import asyncio
+import json
+import os
+import warnings
+from collections import deque
+from typing import NamedTuple
+
+from database import get_db
+from models import Equipe
+from scoring import Classificacao, MotorPontuacao, classificacao_geral
+
+# Seconds between reads of the event log tail
+SSE_INTERVALO = float(os.environ.get("API_SSE_INTERVALO", "0.5"))
+# Recent deltas kept for resuming clients
+SSE_BUFFER = int(os.environ.get("API_SSE_BUFFER", "2000"))
+# Deltas a client may have pending before it is disconnected
+SSE_FILA = int(os.environ.get("API_SSE_FILA", "256"))
+
+# Queued instead of a delta when a slow client is dropped
+FIM = None
+
+
+class Mensagem(NamedTuple):
+    id: int
+    dados: bytes
+
+
+def _sse(evento_id: int, tipo: str, dados: dict) -> bytes:
+    corpo = json.dumps(dados, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {evento_id}\nevent: {tipo}\ndata: {corpo}\n\n".encode()
+
+
+def _reset(evento_id: int) -> bytes:
+    return _sse(evento_id, "reset", {})
+
+
+class Transmissor:
+    def __init__(self, buffer: int = SSE_BUFFER, fila: int = SSE_FILA):
+        # Reads only: snapshots are saved by the Streamlit process, which writes scores
+        self.motor = MotorPontuacao(salvar_snapshots=False)
+        self.fila = fila
+        self._buffer: deque[Mensagem] = deque(maxlen=buffer)
+        # Last event id before the oldest buffered one; resuming from earlier is a gap
+        self._retomavel_desde = 0
+        self._assinantes: set[asyncio.Queue] = set()
+        self._nomes: dict[int, str] = {}
+        self._classificacao = Classificacao()
+
+    @property
+    def ultimo_evento(self) -> int:
+        return self.motor.estado.ultimo_evento if self.motor.estado else 0
+
+    def coletar(self, db) -> list[Mensagem] | None:
+        """Fold new events and build their deltas. Blocking; run it off the event loop.
+
+        Returns None when the batch is larger than the buffer (e.g. a bulk recompute):
+        per-event positions would be useless to clients, who are told to reset instead.
+        """
+        if self.motor.estado is None:
+            # First run: catch up silently, only later events are streamed
+            self.motor.sincronizar(db)
+            self._classificacao = classificacao_geral(db)
+            self._retomavel_desde = self.ultimo_evento
+            return []
+
+        mensagens: list[Mensagem] = []
+        excedeu = False
+
+        def ao_aplicar(evento, estado):
+            nonlocal excedeu
+            if excedeu or len(mensagens) >= self._buffer.maxlen:
+                excedeu = True
+                return
+            total = estado.totais.get(evento.equipe_id, 0)
+            nome = self._nome(db, evento.equipe_id)
+            alcancado_em = evento.created_at.timestamp() if evento.delta > 0 else None
+            self._classificacao.definir(evento.equipe_id, nome or "", total, alcancado_em)
+            mensagens.append(Mensagem(evento.id, _sse(evento.id, evento.tipo, {
+                "equipe_id": evento.equipe_id,
+                "equipe": nome,
+                "questao_id": evento.questao_id,
+                "numero": evento.numero,
+                "acertou": evento.acertou,
+                "pontos": evento.pontos,
+                "delta": evento.delta,
+                "total": total,
+                "posicao": self._classificacao.posicao(evento.equipe_id),
+            })))
+
+        self.motor.sincronizar(db, ao_aplicar)
+        if excedeu:
+            self._classificacao = classificacao_geral(db)
+            return None
+        return mensagens
+
+    def _nome(self, db, equipe_id: int) -> str | None:
+        if equipe_id not in self._nomes:
+            self._nomes = dict(db.query(Equipe.id, Equipe.nome).all())
+        return self._nomes.get(equipe_id)
+
+    def publicar(self, mensagens: list[Mensagem] | None) -> None:
+        """Append to the ring buffer and fan out. Must run on the event loop thread."""
+        if mensagens is None:
+            # Too many to replay: nobody can resume across this gap
+            self._buffer.clear()
+            self._retomavel_desde = self.ultimo_evento
+            mensagens = [Mensagem(self.ultimo_evento, _reset(self.ultimo_evento))]
+        else:
+            for m in mensagens:
+                if len(self._buffer) == self._buffer.maxlen:
+                    self._retomavel_desde = self._buffer[0].id
+                self._buffer.append(m)
+
+        for fila in list(self._assinantes):
+            for m in mensagens:
+                try:
+                    fila.put_nowait(m.dados)
+                except asyncio.QueueFull:
+                    self._derrubar(fila)
+                    break
+
+    def _derrubar(self, fila: asyncio.Queue) -> None:
+        self._assinantes.discard(fila)
+        while not fila.empty():
+            fila.get_nowait()
+        fila.put_nowait(FIM)
+
+    def assinar(self, desde: int | None = None) -> asyncio.Queue:
+        """New subscriber queue, pre-filled with what was missed since `desde`."""
+        fila: asyncio.Queue = asyncio.Queue(maxsize=self.fila)
+        if desde is not None:
+            if desde < self._retomavel_desde or desde > self.ultimo_evento:
+                pendentes = [_reset(self.ultimo_evento)]
+            else:
+                pendentes = [m.dados for m in self._buffer if m.id > desde]
+            if len(pendentes) >= self.fila:
+                pendentes = [_reset(self.ultimo_evento)]
+            for dados in pendentes:
+                fila.put_nowait(dados)
+        self._assinantes.add(fila)
+        return fila
+
+    def cancelar(self, fila: asyncio.Queue) -> None:
+        self._assinantes.discard(fila)
+
+    def _coletar_com_sessao(self) -> list[Mensagem] | None:
+        db = get_db()
+        try:
+            return self.coletar(db)
+        finally:
+            db.close()
+
+    async def produzir(self, intervalo: float = SSE_INTERVALO) -> None:
+        """Producer loop: one tail read per tick, whatever the number of subscribers."""
+        while True:
+            try:
+                mensagens = await asyncio.to_thread(self._coletar_com_sessao)
+            except Exception as exc:  # keep streaming once the database is back
+                warnings.warn(f"Falha ao ler o log de eventos: {exc}")
+            else:
+                if mensagens or mensagens is None:
+                    self.publicar(mensagens)
+            await asyncio.sleep(intervalo)
+
+
+transmissor = Transmissor()